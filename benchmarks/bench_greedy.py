@@ -0,0 +1,30 @@
+import argparse
+import random
+import time
+
+from main import create_dna_test
+from src import GreedySolver
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Times GREEDY and TGREEDY on random DNA instances')
+    parser.add_argument('--input-len', type=int, nargs='+', default=[500, 1000, 2000])
+    parser.add_argument('--len', type=int, default=20, help='Size of a single string')
+    parser.add_argument('--prob', type=float, default=0.2, help='Probability of elimination')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--sparse', action='store_true', help='Use sparse overlap storage')
+    args = parser.parse_args()
+
+    for input_len in args.input_len:
+        random.seed(args.seed)
+        strings = create_dna_test(''.join(random.choices('AGCT', k=input_len)), args.len, args.prob)
+        for algorithm in ('greedy', 't_greedy'):
+            solver = GreedySolver(strings, sparse=args.sparse)
+            start = time.perf_counter()
+            solution = getattr(solver, algorithm)()
+            elapsed = time.perf_counter() - start
+            print(f'n={len(strings)} len={args.len} {algorithm}={elapsed:.3f}s result_len={len(solution)}')
+
+
+if __name__ == '__main__':
+    main()
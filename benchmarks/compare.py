@@ -0,0 +1,47 @@
+import argparse
+import json
+import sys
+from typing import Dict, Tuple
+
+KEY = ('generator', 'size', 'length', 'seed', 'algorithm', 'compact', 'unitigs', 'packed')
+METRICS = ('time', 'peak_rss_kb', 'superstring_length')
+
+
+def load(path: str) -> Dict[Tuple, Dict]:
+    with open(path) as file:
+        # results written before a field was added to KEY get False for it
+        return {tuple(result.get(field, False) for field in KEY): result for result in json.load(file)['results']}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compares two result files of benchmarks.suite')
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='Relative growth of a metric reported as a regression')
+    args = parser.parse_args()
+
+    baseline, candidate = load(args.baseline), load(args.candidate)
+    regressions = 0
+    for key in sorted(baseline.keys() & candidate.keys(), key=repr):
+        changes = []
+        for metric in METRICS:
+            old, new = baseline[key][metric], candidate[key][metric]
+            ratio = new / old if old else 1.0
+            mark = ''
+            if ratio > 1 + args.threshold:
+                mark = ' !'
+                regressions += 1
+            changes.append(f'{metric}={old:.6g}->{new:.6g} (x{ratio:.2f}){mark}')
+        print(' '.join(map(str, key)) + ': ' + ', '.join(changes))
+    for name, missing in (('candidate', baseline.keys() - candidate.keys()),
+                          ('baseline', candidate.keys() - baseline.keys())):
+        if missing:
+            print(f'{len(missing)} jobs are missing in the {name}', file=sys.stderr)
+
+    print(f'{regressions} regressions above {args.threshold:.0%}')
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
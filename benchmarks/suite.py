@@ -0,0 +1,123 @@
+import argparse
+import json
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+from itertools import product
+from multiprocessing import get_context
+from typing import Dict, List, NamedTuple
+
+from main import create_dna_test, create_slice_test
+from src import ALGORITHMS, GreedySolver, HierarchicalSolver
+from utils import ensure_substring_free
+
+GENERATORS = ('dna', 'slice', 'random')
+
+
+class Job(NamedTuple):
+    generator: str
+    size: int  # length of the source string, or the number of strings for the random generator
+    length: int  # length of a single string, the max one for slices
+    seed: int
+    algorithm: str
+    compact: bool
+    unitigs: bool
+    packed: bool
+
+
+def generate(generator: str, size: int, length: int, seed: int) -> List[str]:
+    """
+    Builds the instance deterministically from the seed with the generators of main.py
+    """
+    random.seed(seed)
+    if generator == 'dna':
+        return create_dna_test(''.join(random.choices('ACGT', k=size)), length, 0.2)
+    if generator == 'slice':
+        return create_slice_test(''.join(random.choices('01', k=size)), 4, max(1, length // 2), length, True)
+    if generator == 'random':
+        return ensure_substring_free([''.join(random.choices('ACGT', k=length)) for _ in range(size)])
+    raise ValueError(f'Unknown generator {generator}')
+
+
+def run(job: Job) -> Dict:
+    """
+    Runs a single job in a fresh process, so the peak RSS belongs to this job only.
+    The time covers building the solver (overlaps, graphs) and solving, but not generating the instance
+    """
+    strings = generate(job.generator, job.size, job.length, job.seed)
+    start = time.perf_counter()
+    if job.algorithm in ('greedy', 't_greedy'):
+        superstring = getattr(GreedySolver(strings, 'packed' if job.packed else 'aho_corasick'), job.algorithm)()
+    else:
+        solver = HierarchicalSolver(strings, job.compact, unitigs=job.unitigs, packed=job.packed)
+        superstring = getattr(solver, job.algorithm)()
+    elapsed = time.perf_counter() - start
+    return dict(
+        job._asdict(),
+        n=len(strings),
+        total_length=sum(map(len, strings)),
+        time=elapsed,
+        peak_rss_kb=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        superstring_length=len(superstring),
+        valid=all(string in superstring for string in strings),
+    )
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sweeps every generator and algorithm, writes the results as JSON')
+    parser.add_argument('--generators', nargs='+', choices=GENERATORS, default=list(GENERATORS))
+    parser.add_argument('--sizes', type=int, nargs='+', default=[250, 500, 1000],
+                        help='Source string lengths, numbers of strings for the random generator')
+    parser.add_argument('--lengths', type=int, nargs='+', default=[10, 20], help='Sizes of a single string')
+    parser.add_argument('--algorithms', nargs='+', choices=ALGORITHMS, default=list(ALGORITHMS))
+    parser.add_argument('--seeds', type=int, nargs='+', default=[0])
+    parser.add_argument('--compact', action='store_true', help='Use integer-encoded hierarchical graphs')
+    parser.add_argument('--unitigs', action='store_true', help='Compress non-branching chains of GHA graphs')
+    parser.add_argument('--packed', action='store_true',
+                        help='Hold substrings as bit-packed ints, the greedy algorithms use the packed overlap backend')
+    parser.add_argument('--workers', type=int, default=1, help='Jobs run in parallel, timings are noisier then')
+    parser.add_argument('--output', default='-', help='JSON file with the results, - for stdout')
+    args = parser.parse_args()
+
+    jobs = [
+        Job(generator, size, length, seed, algorithm, args.compact, args.unitigs, args.packed)
+        for generator, size, length, seed, algorithm in product(
+            args.generators, args.sizes, args.lengths, args.seeds, args.algorithms
+        )
+    ]
+    # spawned processes don't inherit the memory of this one, every job gets its own process
+    with get_context('spawn').Pool(args.workers, maxtasksperchild=1) as pool:
+        results = []
+        for result in pool.imap(run, jobs):
+            print(f"{result['generator']} size={result['size']} len={result['length']} seed={result['seed']} "
+                  f"{result['algorithm']}: n={result['n']} time={result['time']:.3f}s "
+                  f"rss={result['peak_rss_kb']}KB result_len={result['superstring_length']}", file=sys.stderr)
+            results.append(result)
+
+    report = {
+        'commit': _commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': results,
+    }
+    if args.output == '-':
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,10 @@
 import argparse
 import random
-from multiprocessing import Pool
 from typing import List
 
-from networkx import symmetric_difference
-
-from src import GreedySolver, HierarchicalSolver
-from utils import ensure_substring_free
+from src import ALGORITHMS, OverlapCache, OverlapIndex, Stats, solve_many
+from src.overlap import OVERLAP_BACKENDS
+from utils import READ_FORMATS, ensure_substring_free, read_strings, verify_solutions
 
 
 def create_dna_test(string: str, length: int, prob: float) -> List[str]:
@@ -64,6 +62,53 @@ def main():
         action='store_true',
         help='print only lengths'
     )
+    parser.add_argument(
+        '--compact',
+        action='store_true',
+        help='use integer-encoded hierarchical graphs'
+    )
+    parser.add_argument(
+        '--unitigs',
+        action='store_true',
+        help='compress non-branching chains of the GHA graph, suits long strings; CA keeps the plain graph'
+    )
+    parser.add_argument(
+        '--packed',
+        action='store_true',
+        help='hold substrings as bit-packed ints in hierarchical graphs and compute overlaps on them, suits DNA; '
+             'excludes --overlap-backend'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        help='directory of the on-disk overlap cache, overlaps are recomputed on every run if not given'
+    )
+    parser.add_argument(
+        '--cache-max-bytes',
+        type=int,
+        help='evict the least recently used cached overlaps above this total size'
+    )
+    parser.add_argument(
+        '--cache-max-entries',
+        type=int,
+        help='evict the least recently used cached overlaps above this number of instances'
+    )
+    parser.add_argument(
+        '--overlap-backend',
+        choices=list(OVERLAP_BACKENDS),
+        help='engine computing the pairwise overlaps, aho_corasick by default (packed with --packed), '
+             'numpy requires the numpy package'
+    )
+    parser.add_argument(
+        '--overlap-workers',
+        type=int,
+        default=1,
+        help='number of processes computing the overlaps'
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='print time, peak memory and operation counts of every phase of the solvers'
+    )
     subparsers = parser.add_subparsers(dest='test_type')
 
     just_input = subparsers.add_parser('input')
@@ -74,6 +119,18 @@ def main():
         help='Input strings'
     )
 
+    from_file = subparsers.add_parser('input_file')
+    from_file.add_argument(
+        '--path',
+        required=True,
+        help='FASTA, FASTQ or plain (one string per line) file, possibly gzip-compressed, - for stdin'
+    )
+    from_file.add_argument(
+        '--format',
+        choices=READ_FORMATS,
+        help='Format of the file, detected by its first line if not given'
+    )
+
     dna_from_given = subparsers.add_parser('dna')
     dna_from_given.add_argument(
         '--input',
@@ -202,8 +259,12 @@ def main():
     )
 
     args = parser.parse_args()
+    if args.packed and args.overlap_backend is not None:
+        parser.error('--packed computes the overlaps on packed strings, it excludes --overlap-backend')
     if args.test_type == 'input':
         strings = args.input
+    elif args.test_type == 'input_file':
+        strings = ensure_substring_free(read_strings(args.path, args.format))
     elif args.test_type == 'dna':
         strings = create_dna_test(args.input, args.len, args.prob)
     elif args.test_type == 'random_dna':
@@ -225,22 +286,33 @@ def main():
         random.shuffle(strings)
     print_data(strings, 'Instance', args.quiet)
 
-    hg_gha = HierarchicalSolver(strings)
-    hg_ca = HierarchicalSolver(strings)
-    with Pool(processes=4) as pool:
-        async_solvers = map(pool.apply_async, [
-            GreedySolver(strings).greedy,
-            GreedySolver(strings).t_greedy,
-            hg_gha.gha,
-            hg_ca.trivial_ca,
-        ])
-        solutions = list(map(lambda x: getattr(x, 'get')(), async_solvers))
+    # overlaps are computed once and mapped by the workers from shared memory
+    cache = OverlapCache(args.cache_dir, args.cache_max_bytes, args.cache_max_entries) if args.cache_dir else None
+    stats = Stats(args.profile, memory=True)
+    with stats.phase('overlaps'):
+        backend = args.overlap_backend or ('packed' if args.packed else 'aho_corasick')
+        overlaps = OverlapIndex(strings, backend, cache, args.overlap_workers).share()
+    stats.stop()
+    try:
+        # solvers are built inside the workers, only the superstrings and the graph digests come back
+        results = {
+            result.algorithm: result
+            for result in solve_many([strings], ALGORITHMS, 4, compact=args.compact,
+                                     overlaps=[overlaps], summarize=True, profile=args.profile,
+                                     unitigs=args.unitigs, packed=args.packed)
+        }
+    finally:
+        overlaps.unlink()
+    solutions = [results[algorithm].superstring for algorithm in ALGORITHMS]
 
     if args.check_correctness:
-        for i, solution in enumerate(solutions):
-            for string in strings:
-                if string not in solution:
-                    raise Exception(f'Solver #{i} produced incorrect solution: {string} in not in {solution}')
+        errors = [
+            f'Solver #{i} produced incorrect solution: {missing} are not in {solution}'
+            for i, (solution, missing) in enumerate(zip(solutions, verify_solutions(strings, solutions, 4)))
+            if missing
+        ]
+        if errors:
+            raise Exception('\n'.join(errors))
         if not args.quiet:
             print('Solutions are valid!')
 
@@ -249,7 +321,18 @@ def main():
     print_data(solutions[2], 'GHA', args.quiet)
     print_data(solutions[3], 'CA + trivial', args.quiet)
     print('Collapsing Conjecture holds?',
-          'Yes' if len(symmetric_difference(hg_ca.hg.graph, hg_gha.hg.graph).edges()) == 0 else 'No')
+          'Yes' if results['trivial_ca'].graph_digest == results['gha'].graph_digest else 'No')
+
+    if args.profile:
+        print('Profile of the shared overlaps:', stats.report(), sep='\n')
+        for algorithm in ALGORITHMS:
+            solver_stats = results[algorithm].stats
+            print(f'Profile of {algorithm}:')
+            for name, phase in solver_stats['phases'].items():
+                print(f"{name}: {phase['time']:.3f}s, {phase['calls']} calls, "
+                      f"peak {phase['peak_memory'] / 2 ** 20:.1f} MiB")
+            for name, value in solver_stats['counters'].items():
+                print(f'{name}: {value}')
 
 
 if __name__ == '__main__':
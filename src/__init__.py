@@ -1,2 +1,7 @@
-from .greedy import GreedySolver
-from .hierarchical import HierarchicalGraph, HierarchicalSolver
+from .batch import ALGORITHMS, BatchResult, graph_digest, solve_many
+from .greedy import GreedySolver, Progress
+from .hierarchical import (CompactHierarchicalGraph, HierarchicalGraph, HierarchicalSolver, PackedHierarchicalGraph,
+                           UnitigHierarchicalGraph)
+from .overlap_cache import OverlapCache
+from .overlap_index import OverlapIndex
+from .stats import PhaseStats, Stats
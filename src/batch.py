@@ -0,0 +1,122 @@
+import hashlib
+import time
+from collections import Counter
+from multiprocessing import Pool
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from .greedy import GreedySolver
+from .hierarchical import (CompactHierarchicalGraph, HierarchicalGraph, HierarchicalSolver, PackedHierarchicalGraph,
+                           UnitigHierarchicalGraph)
+from .sparse import SparseOverlaps
+from .stats import Stats
+
+# names of the solver methods
+ALGORITHMS: Tuple[str, ...] = ('greedy', 't_greedy', 'gha', 'trivial_ca')
+
+
+class BatchResult(NamedTuple):
+    instance: int  # position of the instance in the input
+    algorithm: str
+    superstring: str
+    elapsed: float  # seconds spent in the worker
+    graph_digest: Optional[str] = None  # see graph_digest, hierarchical algorithms only
+    stats: Optional[Dict] = None  # Stats.as_dict of the solver, profiled jobs only
+
+
+class _Job(NamedTuple):
+    """
+    Everything a worker needs to build a solver, the solver itself never crosses the process boundary
+    """
+    instance: int
+    strings: List[str]
+    algorithm: str
+    compact: bool
+    unitigs: bool
+    packed: bool
+    overlaps: Optional[SparseOverlaps]
+    summarize: bool
+    time_budget: Optional[float]
+    profile: bool
+
+
+def graph_digest(hg: Union[HierarchicalGraph, CompactHierarchicalGraph, UnitigHierarchicalGraph,
+                            PackedHierarchicalGraph]) -> str:
+    """
+    Hash of the multiset of the edges of a hierarchical graph, equal graphs have equal digests
+    regardless of their representation
+    """
+    digest = hashlib.sha256()
+    for (u, v), count in sorted(Counter(hg.graph.edges()).items()):
+        digest.update(repr((u, v, count)).encode('utf-8', 'surrogatepass'))
+    return digest.hexdigest()
+
+
+def _solve_job(job: _Job) -> BatchResult:
+    stats = Stats(memory=True) if job.profile else None
+    start = time.perf_counter()
+    solver: Union[GreedySolver, HierarchicalSolver]
+    if job.algorithm in ('greedy', 't_greedy'):
+        solver = GreedySolver(job.strings, 'packed' if job.packed else 'aho_corasick', overlaps=job.overlaps,
+                              stats=stats)
+        superstring = getattr(solver, job.algorithm)(job.time_budget)
+    else:
+        solver = HierarchicalSolver(job.strings, job.compact, job.overlaps, stats, job.unitigs, job.packed)
+        superstring = getattr(solver, job.algorithm)(job.time_budget)
+    elapsed = time.perf_counter() - start
+    if stats is not None:
+        stats.stop()
+    digest = graph_digest(solver.hg) if job.summarize and isinstance(solver, HierarchicalSolver) else None
+    return BatchResult(job.instance, job.algorithm, superstring, elapsed, digest,
+                       stats.as_dict() if stats is not None else None)
+
+
+def solve_many(instances: Sequence[List[str]], algorithms: Sequence[str] = ALGORITHMS, workers: int = 1,
+               shard: Tuple[int, int] = (0, 1), compact: bool = False,
+               overlaps: Optional[Sequence[Optional[SparseOverlaps]]] = None,
+               summarize: bool = False, time_budget: Optional[float] = None,
+               profile: bool = False, unitigs: bool = False, packed: bool = False) -> Iterator[BatchResult]:
+    """
+    Solves every instance with every algorithm and yields the results as soon as they are ready.
+    Every (instance, algorithm) pair is a separate job, the solver is built inside the worker from the strings.
+    Jobs are handed out one at a time, the largest instances first, so a worker which is done
+    takes the next job while the others are still busy with the long ones
+    :param instances: lists of strings
+    :param algorithms: names from ALGORITHMS
+    :param workers: number of processes, the jobs are solved in the current process if it is 1
+    :param shard: (index, count), solve only the jobs whose number in the instance-major order
+    is index modulo count, so a large batch can be split across several runs. Only whole jobs are distributed:
+    the algorithms of one instance may land in different runs, but a single job is never split
+    :param compact: use CompactHierarchicalGraph for the hierarchical algorithms
+    :param overlaps: precomputed overlaps for every instance, a shared OverlapIndex is sent to the workers by name
+    :param summarize: attach the graph_digest of the final graph to the results of the hierarchical algorithms
+    :param time_budget: seconds per job, the best superstring found so far is returned when it runs out:
+    the current chains for the greedy algorithms (see GreedySolver.iter_greedy), the trivial solution for CA
+    and the concatenation of the strings otherwise (see HierarchicalSolver.iter_trivial_ca).
+    The graph digest then describes the graph as it was stopped
+    :param profile: attach the phase times, peak memory and operation counts of every solver to its result,
+    memory tracing makes the profiled jobs noticeably slower
+    :param unitigs: use UnitigHierarchicalGraph for GHA, CA keeps HierarchicalGraph
+    :param packed: use PackedHierarchicalGraph for the hierarchical algorithms and the packed overlap backend
+    for the greedy ones if their overlaps are not given
+    """
+    for algorithm in algorithms:
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f'Unknown algorithm {algorithm}')
+    index, count = shard
+    if not 0 <= index < count:
+        raise ValueError(f'Invalid shard {index} of {count}')
+    if compact + unitigs + packed > 1:
+        raise ValueError('Compact, unitig and packed graphs are mutually exclusive')
+
+    jobs = [
+        _Job(instance, strings, algorithm, compact, unitigs, packed, overlaps[instance] if overlaps else None,
+             summarize, time_budget, profile)
+        for instance, strings in enumerate(instances) for algorithm in algorithms
+    ][index::count]
+    jobs.sort(key=lambda job: -sum(map(len, job.strings)))  # stable, so the ties keep the input order
+
+    if workers == 1:
+        yield from map(_solve_job, jobs)
+        return
+    with Pool(workers) as pool:
+        yield from pool.imap_unordered(_solve_job, jobs)
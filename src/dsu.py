@@ -1,4 +1,21 @@
-from typing import Dict, List
+from array import array
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence
+
+from .stats import Stats
+
+
+def _count_finds(dsu, stats: Optional[Stats]):
+    """
+    Shadows find_parent of the instance with a counting wrapper, so a DSU without stats pays nothing
+    """
+    if stats is None or not stats.enabled:
+        return
+    find_parent = dsu.find_parent
+
+    def counted(a):
+        stats.count('dsu_finds')
+        return find_parent(a)
+    dsu.find_parent = counted
 
 
 class DSU:
@@ -6,16 +23,38 @@ class DSU:
     Disjoint set union class with additional field for such string that:
     1. It is the shortest among all the strings in set
     2. It is the largest among all the string from step 1
+    Strings missing from the initial list are added as singletons on first use
     """
-    def __init__(self, strings: List[str]):
+    def __init__(self, strings: List[str], key: Optional[Callable[[Hashable], Any]] = None,
+                 stats: Optional[Stats] = None):
+        """
+        :param strings: initial singletons
+        :param key: last[root] is the element of the set with the largest key, (-len(x), x) by default,
+        e.g. other node representations can pass an equivalent key
+        :param stats: counts the finds as 'dsu_finds' if enabled
+        """
         self.last: Dict[str, str] = {string: string for string in strings}
         self._parent: Dict[str, str] = {string: string for string in strings}
         self._rank: Dict[str, int] = {string: 0 for string in strings}
+        self._key: Callable[[Hashable], Any] = key if key is not None else lambda x: (-len(x), x)
+        _count_finds(self, stats)
+
+    def add(self, a: str):
+        self.last[a] = a
+        self._parent[a] = a
+        self._rank[a] = 0
 
     def find_parent(self, a: str):
-        if self._parent[a] != a:
-            self._parent[a] = self.find_parent(self._parent[a])
-        return self._parent[a]
+        parent = self._parent
+        if a not in parent:
+            self.add(a)
+            return a
+        root = a
+        while parent[root] != root:
+            root = parent[root]
+        while parent[a] != root:
+            parent[a], a = root, parent[a]
+        return root
 
     def union(self, a: str, b: str):
         a = self.find_parent(a)
@@ -28,7 +67,50 @@ class DSU:
         self._parent[b] = a
         if self._rank[a] == self._rank[b]:
             self._rank[a] += 1
-        if (-len(self.last[a]), self.last[a]) < (-len(self.last[b]), self.last[b]):
+        if self._key(self.last[a]) < self._key(self.last[b]):
+            self.last[a] = self.last[b]
+        else:
+            self.last[b] = self.last[a]
+
+
+class ArrayDSU:
+    """
+    Disjoint set union over integer handles 0..size-1 backed by flat arrays, with iterative path compression.
+    Like in DSU, last[root] is the element of the set with the largest key, here the key of x is order[x]
+    """
+    def __init__(self, size: int, order: Optional[Sequence[int]] = None, stats: Optional[Stats] = None):
+        """
+        :param size: number of elements
+        :param order: integer keys of elements, by default an element is its own key
+        :param stats: counts the finds as 'dsu_finds' if enabled
+        """
+        self.last: array = array('i', range(size))
+        self._parent: array = array('i', range(size))
+        self._rank: array = array('b', bytes(size))
+        self._order: Sequence[int] = range(size) if order is None else order
+        _count_finds(self, stats)
+
+    def find_parent(self, a: int) -> int:
+        parent = self._parent
+        root = a
+        while parent[root] != root:
+            root = parent[root]
+        while parent[a] != root:
+            parent[a], a = root, parent[a]
+        return root
+
+    def union(self, a: int, b: int):
+        a = self.find_parent(a)
+        b = self.find_parent(b)
+        if a == b:
+            return
+
+        if self._rank[a] < self._rank[b]:
+            a, b = b, a
+        self._parent[b] = a
+        if self._rank[a] == self._rank[b]:
+            self._rank[a] += 1
+        if self._order[self.last[a]] < self._order[self.last[b]]:
             self.last[a] = self.last[b]
         else:
             self.last[b] = self.last[a]
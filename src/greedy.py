@@ -1,24 +1,129 @@
-from collections import defaultdict
-from itertools import permutations
-from typing import Dict, List, Iterable, Tuple
+import time
+from functools import partial
+from itertools import chain, permutations
+from typing import Callable, Dict, Iterator, List, Iterable, NamedTuple, Optional, Tuple, Union
 
-import networkx as nx
+from .dsu import ArrayDSU
+from .overlap import all_overlaps, calculate_overlap
+from .overlap_cache import OverlapCache
+from .overlap_index import OverlapIndex
+from .sparse import SparseOverlaps
+from .stats import NO_STATS, Stats, timed, until
+from utils import AhoCorasick, bucket_edges, drain_buckets
 
-from .overlap import calculate_overlap
-from utils import counting_sort
+_REPORTS = 100  # progress reports of a step by step run by default, each one copies the O(n) chain links
+
+
+class Progress(NamedTuple):
+    edges: int  # accepted edges
+    contigs: int  # number of chains and cycles the strings are merged into so far
+    length: int  # length of the superstring made of the current contigs
+    superstring: Callable[[], str]  # concatenates the contigs as of this report, it is always a valid superstring
+    done: bool  # the algorithm is finished and the superstring is its result
 
 
 class GreedySolver:
-    def __init__(self, strings: List[str]):
+    def __init__(self, strings: List[str], overlap_backend: str = 'aho_corasick',
+                 sparse: bool = False, top_k: Optional[int] = None,
+                 overlaps: Optional[Union[Iterable[Tuple[int, int, int]], SparseOverlaps]] = None,
+                 cache: Optional[OverlapCache] = None, workers: int = 1, stats: Optional[Stats] = None):
+        """
+        :param strings: input strings
+        :param overlap_backend: engine used to compute pairwise overlaps, see src.overlap.OVERLAP_BACKENDS
+        :param sparse: store only nonzero overlaps in CSR form instead of the dense n^2 map
+        :param top_k: keep only k largest overlaps per string (implies sparse); the result is still
+        a valid superstring, but it may differ from the dense one
+        :param overlaps: precomputed (i, j, overlap) for all the pairs with nonzero overlap,
+        if not given, they are computed by overlap_backend. An OverlapIndex (or any SparseOverlaps) over the same
+        strings is used as the storage as is, unless top_k has to be applied
+        :param cache: on-disk cache of overlaps, used when overlaps are not given
+        :param workers: number of processes computing the overlaps, the result doesn't depend on it
+        :param stats: collects the time of the phases and the counts of the operations, nothing by default
+        """
+        self._stats: Stats = stats if stats is not None else NO_STATS
         self._str_to_int: Dict[str, int] = {}
         self._strings: List[str] = strings
-        self._overlaps: Dict[Tuple[int, int], int] = {}
+        self._overlap_backend: str = overlap_backend
+        self._sparse: bool = sparse or top_k is not None
+        self._top_k: Optional[int] = top_k
         self._n: int = len(strings)
 
         for i, string in enumerate(strings):
             self._str_to_int[string] = i
-        for i, j in permutations(range(self._n), 2):
-            self._overlaps[(i, j)] = calculate_overlap(strings[i], strings[j])
+        self._overlaps: Union[Dict[Tuple[int, int], int], SparseOverlaps] = self._store_overlaps(
+            overlaps, cache, workers
+        )
+
+    @timed('overlaps')
+    def _store_overlaps(self, overlaps: Optional[Union[Iterable[Tuple[int, int, int]], SparseOverlaps]],
+                        cache: Optional[OverlapCache],
+                        workers: int) -> Union[Dict[Tuple[int, int], int], SparseOverlaps]:
+        """
+        Computes the overlaps unless they are given and puts them into the dense or the sparse storage
+        """
+        if overlaps is None and cache is not None:
+            overlaps = OverlapIndex(self._strings, self._overlap_backend, cache, workers)
+        elif overlaps is None:
+            overlaps = all_overlaps(self._strings, self._overlap_backend, workers)
+
+        if isinstance(overlaps, SparseOverlaps) and self._top_k is None:
+            return overlaps
+        if isinstance(overlaps, SparseOverlaps):
+            return SparseOverlaps(self._n, overlaps.triples(), self._top_k)
+        if self._sparse:
+            return SparseOverlaps(self._n, overlaps, self._top_k)
+        dense = {edge: 0 for edge in permutations(range(self._n), 2)}
+        for i, j, overlap in overlaps:
+            dense[(i, j)] = overlap
+        return dense
+
+    def _sorted_edges(self, is_tail_free: Callable[[int], bool], is_head_free: Callable[[int], bool],
+                      deadline: Optional[float] = None) -> Iterator[Tuple[int, int]]:
+        """
+        Streams all the edges of the overlap graph in descending order of overlap with lexicographic ties.
+        Nonzero edges are bucketed straight from the overlap storage before returning (the 'sort_edges' phase),
+        zero-overlap edges are generated lazily
+        :param deadline: perf_counter time after which TimeoutError is raised, both while bucketing and streaming
+        """
+        with self._stats.phase('sort_edges'):
+            buckets = bucket_edges(self._n, until(deadline, self._overlaps.items()))
+        return until(deadline, chain(
+            drain_buckets(self._n, buckets),
+            self._fallback_edges(is_tail_free, is_head_free),
+        ))
+
+    def _fallback_edges(self, is_tail_free: Callable[[int], bool],
+                        is_head_free: Callable[[int], bool]) -> Iterator[Tuple[int, int]]:
+        """
+        Lazily yields the edges (i, j), i != j, in lexicographic order, skipping the ones with a used tail or head.
+        Both algorithms never free an endpoint once it is used, so the skipped edges would be rejected anyway
+        and the accepted ones are the same as if the whole zero-overlap bucket was scanned
+        """
+        nxt = list(range(self._n + 1))  # nxt chains lead to the smallest candidate head >= j
+
+        def find(j: int) -> int:
+            root = j
+            while nxt[root] != root:
+                root = nxt[root]
+            while nxt[j] != root:
+                nxt[j], j = root, nxt[j]
+            return root
+
+        for i in range(self._n):
+            j = find(0)
+            while j < self._n and is_tail_free(i):
+                if not is_head_free(j):
+                    nxt[j] = j + 1
+                elif i != j:
+                    yield i, j
+                j = find(j + 1)
+
+    def _count_edges(self, examined: int, accepted: int):
+        """
+        Reports the work of an edge scan, the DSU finds are counted by the DSU itself
+        """
+        self._stats.count('edges_examined', examined)
+        self._stats.count('edges_accepted', accepted)
 
     def _path_to_string(self, path: Iterable[Tuple[int, int]]) -> str:
         """
@@ -42,60 +147,170 @@ class GreedySolver:
 
         return result
 
-    def greedy(self) -> str:
+    @staticmethod
+    def _chain_edges(head: int, succ: List[int], tail: int = -1) -> Iterator[Tuple[int, int]]:
+        """
+        Yields the edges of the chain starting at head until tail or the end of the chain
+        """
+        while head != tail and succ[head] != -1:
+            yield head, succ[head]
+            head = succ[head]
+
+    def _chains_to_string(self, succ: List[int], pred: List[int]) -> str:
+        """
+        Concatenates all the chains, it is a valid superstring at any step of the algorithms
+        """
+        return ''.join(
+            self._path_to_string(self._chain_edges(head, succ)) if succ[head] != -1 else self._strings[head]
+            for head in range(self._n) if pred[head] == -1
+        )
+
+    def iter_greedy(self, every: Optional[int] = None, time_budget: Optional[float] = None) -> Iterator[Progress]:
+        """
+        Runs the classical greedy algorithm step by step
+        :param every: report the progress after every this many accepted edges, a report copies the O(n) chain links,
+        so there are about _REPORTS of them by default
+        :param time_budget: stop after this many seconds, the last progress is not done then
+        :return: progress reports, the last one is reported when the algorithm is finished or stopped
+        """
+        every = max(1, self._n // _REPORTS) if every is None else every
+        deadline = None if time_budget is None else time.perf_counter() + time_budget
+        # every accepted edge joins the tail of one chain to the head of another one,
+        # so an edge closes a cycle iff both of its ends are already in the same chain
+        succ, pred = [-1] * self._n, [-1] * self._n
+        chains = ArrayDSU(self._n, stats=self._stats)
+        edges, length = 0, sum(map(len, self._strings))
+
+        def progress(done: bool) -> Progress:
+            # the chains are copied, so the report stays valid after the algorithm goes on
+            return Progress(edges, self._n - edges, length, partial(self._chains_to_string, succ[:], pred[:]), done)
+
+        examined = 0
+        try:
+            candidates = self._sorted_edges(lambda x: succ[x] == -1, lambda x: pred[x] == -1, deadline)
+            with self._stats.phase('greedy'):
+                for examined, (a, b) in enumerate(candidates, 1):
+                    if succ[a] != -1 or pred[b] != -1:
+                        continue
+                    if chains.find_parent(a) == chains.find_parent(b):
+                        continue
+                    succ[a], pred[b] = b, a
+                    chains.union(a, b)
+                    edges += 1
+                    length -= self._overlaps[(a, b)]
+                    if edges == self._n - 1:  # a single chain is left
+                        break
+                    if edges % every == 0:
+                        yield progress(False)
+        except TimeoutError:
+            yield progress(False)
+            return
+        finally:
+            self._count_edges(examined, edges)
+
+        yield progress(True)
+
+    def greedy(self, time_budget: Optional[float] = None) -> str:
         """
         Solves given SSP instance by using the classical greedy algorithm
+        :param time_budget: if the time runs out, the current chains are concatenated
         """
-        # this case would break path-to-string because the path would be source -> string -> sink
-        if len(self._strings) == 1:
-            return self._strings[0]
+        *_, last = self.iter_greedy(max(1, self._n), time_budget)
+        return last.superstring()
 
-        graph = nx.DiGraph()
-        graph.add_nodes_from(range(self._n + 2))  # all the strings plus a source and a sink
-        edges = list(permutations(range(self._n), 2))
-        edges = counting_sort(edges, self._overlaps)
-        edges.extend([(self._n, i) for i in range(self._n)])  # self._n is a source
-        edges.extend([(i, self._n + 1) for i in range(self._n)])  # (self._n + 1) is a sink
+    def iter_t_greedy(self, every: Optional[int] = None, time_budget: Optional[float] = None) -> Iterator[Progress]:
+        """
+        Runs the TGREEDY algorithm step by step: the cycle cover is reported as in GREEDY,
+        then the greedy merge of the cycle strings is reported with the edge counts of both phases added up
+        :param every: report the progress after every this many accepted edges, a report copies the O(n) chain links,
+        so there are about _REPORTS of them by default
+        :param time_budget: stop after this many seconds, the last progress is not done then
+        :return: progress reports, the last one is reported when the algorithm is finished or stopped
+        """
+        every = max(1, self._n // _REPORTS) if every is None else every
+        deadline = None if time_budget is None else time.perf_counter() + time_budget
+        succ, pred = [-1] * self._n, [-1] * self._n
+        chains = ArrayDSU(self._n, stats=self._stats)
+        cycles: List[Tuple[str, int, int]] = []  # (string, index of its last string, index of its first string)
+        edges, length = 0, sum(map(len, self._strings))
 
-        reachable = defaultdict(set)
-        for edge in edges:
-            if graph.out_degree(edge[0]) != 0 or graph.in_degree(edge[1]) != 0 or edge[0] in reachable[edge[1]]:
-                continue
-            graph.add_edge(*edge)
-            prefix = nx.ancestors(graph, edge[1])
-            suffix = nx.descendants(graph, edge[0])
-            for v in prefix:
-                for u in suffix:
-                    reachable[v].add(u)
+        def progress() -> Progress:
+            contigs, chains_succ, chains_pred = cycles[:], succ[:], pred[:]
+            return Progress(
+                edges, self._n - edges + len(cycles), length,
+                lambda: ''.join(string for string, _, _ in contigs) + self._chains_to_string(chains_succ, chains_pred),
+                False,
+            )
+
+        examined = 0
+        try:
+            candidates = self._sorted_edges(lambda x: succ[x] == -1, lambda x: pred[x] == -1, deadline)
+            with self._stats.phase('cycle_cover'):
+                for examined, (a, b) in enumerate(candidates, 1):
+                    if succ[a] != -1 or pred[b] != -1:
+                        continue
+                    succ[a], pred[b] = b, a
+                    edges += 1
+
+                    if chains.find_parent(a) == chains.find_parent(b):  # cycle
+                        cycles.append((self._path_to_string(self._chain_edges(b, succ, a)), a, b))
+                    else:
+                        chains.union(a, b)
+                        length -= self._overlaps[(a, b)]
+                    if edges % every == 0:
+                        yield progress()
+        except TimeoutError:
+            yield progress()
+            return
+        finally:
+            self._count_edges(examined, edges)
+            self._stats.count('cycles', len(cycles))
 
-        return self._path_to_string(nx.eulerian_path(graph))
+        # unlike in GREEDY, some nodes might left isolated
+        cycles.extend((self._strings[x], x, x) for x in range(self._n) if succ[x] == -1 and pred[x] == -1)
+        strings = [string for string, _, _ in cycles]
+        solver = GreedySolver(
+            strings, self._overlap_backend, self._sparse, self._top_k, overlaps=self._cycle_overlaps(cycles),
+            stats=self._stats,
+        )
+        remaining = None if deadline is None else max(0.0, deadline - time.perf_counter())
+        for report in solver.iter_greedy(every, remaining):
+            yield report._replace(edges=edges + report.edges)
 
-    def t_greedy(self) -> str:
+    def t_greedy(self, time_budget: Optional[float] = None) -> str:
         """
         Solves given SSP instance by using the TGREEDY algorithm
+        :param time_budget: if the time runs out, the current cycles and chains are concatenated
         """
-        graph = nx.DiGraph()
-        graph.add_nodes_from(range(self._n))
-        edges = list(permutations(range(self._n), 2))
-        edges = counting_sort(edges, self._overlaps)
+        *_, last = self.iter_t_greedy(max(1, self._n), time_budget)
+        return last.superstring()
 
-        strings = []
-        reachable = defaultdict(set)
-        for edge in edges:
-            if graph.out_degree(edge[0]) != 0 or graph.in_degree(edge[1]) != 0:
-                continue
-            graph.add_edge(*edge)
-
-            if edge[0] in reachable[edge[1]]:  # cycle
-                cycle_string = self._path_to_string(nx.find_cycle(graph, source=edge[1]))
-                strings.append(cycle_string)
-            else:
-                prefix = nx.ancestors(graph, edge[1])
-                suffix = nx.descendants(graph, edge[0])
-                for v in prefix:
-                    for u in suffix:
-                        reachable[v].add(u)
+    def _cycle_overlaps(self, cycles: List[Tuple[str, int, int]]) -> Iterator[Tuple[int, int, int]]:
+        """
+        Yields nonzero overlaps between cycle strings reusing the already known overlaps.
+        An overlap of cycles x and y equals the overlap of the last string of x and the first string of y
+        unless it is longer than one of them. Then the first string of y occurs in x before its end or
+        the last string of x occurs in y after its start, so only such pairs are recomputed explicitly
+        :param cycles: (string, index of its last string, index of its first string) for every cycle
+        """
+        suspicious = set()
+        heads = AhoCorasick([self._strings[head] for _, _, head in cycles])
+        tails = AhoCorasick([self._strings[tail] for _, tail, _ in cycles])
+        for x, (string, _, _) in enumerate(cycles):
+            for end, y in heads.iter_matches(string):
+                if end != len(string):
+                    suspicious.add((x, y))
+            for end, y in tails.iter_matches(string):
+                if end != len(self._strings[cycles[y][1]]):
+                    suspicious.add((y, x))
 
-        # unlike in GREEDY, some nodes might left isolated
-        strings.extend(map(lambda x: self._strings[x], nx.isolates(graph)))
-        return GreedySolver(strings).greedy()
+        for x, (_, tail, _) in enumerate(cycles):
+            for y, (_, _, head) in enumerate(cycles):
+                if x != y and (x, y) not in suspicious:
+                    overlap = self._overlaps[(tail, head)]
+                    if overlap:
+                        yield x, y, overlap
+        for x, y in suspicious:
+            overlap = calculate_overlap(cycles[x][0], cycles[y][0])
+            if x != y and overlap:
+                yield x, y, overlap
@@ -1,148 +1,782 @@
-from typing import List
+import time
+from array import array
+from collections import defaultdict
+from functools import partial
+from itertools import chain
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple, TypeVar, Union
 
 import networkx as nx
 
-from .dsu import DSU
+from .dsu import DSU, ArrayDSU
+from .greedy import Progress
 from .overlap import calculate_overlap
+from .sparse import SparseOverlaps
+from .stats import NO_STATS, Stats, timed, until
+from .suffix_trie import SuffixTrie
+from utils import AhoCorasick, Packer
 
+Node = TypeVar('Node', bound=Hashable)
 
-class HierarchicalGraph:
-    def __init__(self, strings: List[str]):
-        self.graph = nx.MultiDiGraph()
-        self._strings: List[str] = strings
-        self._n: int = len(strings)
 
-        for string in strings:
-            for i in range(len(string)):
-                for j in range(i + 1, len(string) + 1):
-                    self.graph.add_node(string[i:j])
-        self.graph.add_node('')
+def _next_overlap(strings: List[str], i: int, overlaps: Optional[SparseOverlaps] = None) -> int:
+    """
+    Overlap of strings[i] with the next string, 0 for the last one
+    :param overlaps: precomputed overlaps of strings, calculated explicitly if not given
+    """
+    if i + 1 == len(strings):
+        return 0
+    if overlaps is not None:
+        return overlaps[(i, i + 1)]
+    return calculate_overlap(strings[i], strings[i + 1])
+
+
+def _merge(strings: List[str], overlaps: Optional[SparseOverlaps] = None) -> str:
+    """
+    Concatenation of the strings without the overlaps of the neighbours, the string of the trivial solution
+    """
+    parts, overlap = [], 0
+    for i, string in enumerate(strings):
+        parts.append(string[overlap:])
+        overlap = _next_overlap(strings, i, overlaps)
+    return ''.join(parts)
+
+
+def _eulerian_string(source: Node, out_edges: Callable[[Node], List[List]],
+                     imbalance: Iterable[Tuple[Node, int]], num_edges: int) -> str:
+    """
+    Spells the eulerian path starting from source using iterative Hierholzer's algorithm
+    :param source: node of the empty string
+    :param out_edges: returns [target, multiplicity, spelled char] for every edge going from given node,
+    the char is empty for the edges going down
+    :param imbalance: (node, outdegree - indegree) for all the unbalanced nodes
+    :param num_edges: total number of edges in the graph
+    """
+    imbalance = dict(imbalance)
+    if imbalance and (
+            len(imbalance) != 2 or imbalance.get(source) != 1 or sorted(imbalance.values()) != [-1, 1]
+    ):
+        raise ValueError('Graph does not contain an eulerian solution: degrees are not balanced')
+
+    adjacency: Dict[Node, Tuple[List[List], List[int]]] = {}
+    stack, spelled, used = [(source, '')], [], 0
+    while stack:
+        node = stack[-1][0]
+        if node not in adjacency:
+            adjacency[node] = out_edges(node), [0]
+        edges, position = adjacency[node]
+        while position[0] < len(edges) and edges[position[0]][1] == 0:
+            position[0] += 1
+
+        if position[0] < len(edges):
+            edge = edges[position[0]]
+            edge[1] -= 1
+            used += 1
+            stack.append((edge[0], edge[2]))
+        else:
+            spelled.append(stack.pop()[1])
+
+    if used != num_edges:
+        raise ValueError(f'Graph does not contain an eulerian solution: {num_edges - used} edges are not reachable')
+    return ''.join(reversed(spelled))
+
+
+class _HierarchicalAlgorithms:
+    """
+    GHA, CA and the eulerian path over the node operations of a hierarchical graph representation.
+    Every edge goes either from a node to its one char extension (up) or from a node to itself without
+    the first char (down), so an edge is determined by its longer end: _up_in[v] is the multiplicity of
+    _parent(v) -> v and _down_out[v] the one of v -> _link(v), while _up_out and _down_in sum them at the other end
+    """
+    _root: Hashable  # the empty string
+    _strings: List[str]
+    _overlaps: Optional[SparseOverlaps]
+    _n: int
+    _stats: Stats
+    _up_in: Union[Dict, array]
+    _up_out: Union[Dict, array]
+    _down_in: Union[Dict, array]
+    _down_out: Union[Dict, array]
+
+    def _parent(self, node: Node) -> Node:
+        raise NotImplementedError
+
+    def _link(self, node: Node) -> Node:
+        raise NotImplementedError
+
+    def _length(self, node: Node) -> int:
+        raise NotImplementedError
+
+    def _string_nodes(self) -> List[Node]:
+        """
+        Nodes of the input strings in their order
+        """
+        raise NotImplementedError
+
+    def _nodes(self) -> Iterator[Node]:
+        """
+        Yields the nodes except the empty string in (-len, lexicographic) order.
+        Edges are only added between shorter nodes than the current one, so the order may be generated lazily
+        """
+        raise NotImplementedError
+
+    def _all_nodes(self) -> Iterable[Node]:
+        """
+        All the nodes which might have an edge, including the empty string
+        """
+        raise NotImplementedError
+
+    def _children(self) -> Callable[[Node], List[Tuple[Node, str]]]:
+        """
+        :return: function giving (child, spelled chars) for the up edges going from a node
+                 in reverse lexicographic order
+        """
+        raise NotImplementedError
+
+    def _dsu(self) -> Union[DSU, ArrayDSU]:
+        return DSU([], stats=self._stats)
+
+    def _double(self):
+        for counts in (self._up_in, self._up_out, self._down_in, self._down_out):
+            for node in counts:
+                counts[node] *= 2
+
+    def _before_move(self, node: Node):
+        """
+        Called before collapsing moves replace the edges of node
+        """
+
+    def _add_up(self, node: Node, count: int = 1):
+        raise NotImplementedError
+
+    def _add_down(self, node: Node, count: int = 1):
+        raise NotImplementedError
+
+    def _degree(self, node: Node) -> int:
+        return self._up_in[node] + self._up_out[node] + self._down_in[node] + self._down_out[node]
 
+    def _edge_counts(self) -> Tuple[int, int]:
+        """
+        Numbers of the up and of the down edges, a solution spells one char per up edge
+        """
+        return sum(self._up_in.values()), sum(self._down_out.values())
+
+    @timed('euler_path')
     def to_string(self) -> str:
         """
-        Extract an eulerian solution from current graph.
-        Warning: if graph does not contain an eulerian solution,
-        the behaviour of this function is undefined
+        Extract an eulerian solution from current graph, edges going up are taken first in reverse lexicographic order.
+        Raises ValueError if graph does not contain an eulerian solution
         """
-        subgraph = self.graph.subgraph(nx.node_connected_component(self.graph.to_undirected(as_view=True), ''))
-        path, result = nx.eulerian_path(subgraph, source=''), ''
-        for edge in path:
-            if len(edge[0]) < len(edge[1]):
-                result += edge[1][-1]
+        children = self._children()
 
-        return result
+        def out_edges(node: Node) -> List[List]:
+            edges = [[child, self._up_in[child], label] for child, label in children(node)]
+            if node != self._root:  # the edge going down is the last one
+                edges.append([self._link(node), self._down_out[node], ''])
+            return edges
 
-    def double_and_collapse(self):
+        imbalance, num_edges = [], 0
+        for node in self._all_nodes():
+            up, down = self._up_in[node], self._down_out[node]
+            num_edges += up + down
+            if self._up_out[node] + down - up - self._down_in[node]:
+                imbalance.append((node, self._up_out[node] + down - up - self._down_in[node]))
+        return _eulerian_string(self._root, out_edges, imbalance, num_edges)
+
+    @timed('collapse')
+    def double_and_collapse(self, deadline: Optional[float] = None):
         """
-        Doubles all the edges in given solution and applies the collapsing algorithm
+        Doubles all the edges in given solution and applies the collapsing algorithm.
+        All the moves collapsing a node are applied at once
         Warning #1: if graph does not contain a solution, the behaviour of this function is undefined
         Warning #2: if Collapsing Conjecture doesn't hold, this function might produce incorrect solution
+        :param deadline: perf_counter time after which TimeoutError is raised, the graph is left half collapsed then
         """
-        for edge in list(self.graph.edges()):
-            self.graph.add_edge(*edge)
-
-        nodes = list(self.graph.nodes())
-        nodes.sort(key=lambda x: (-len(x), x))
-        dsu = DSU(nodes)
-        nodes.pop()  # remove empty string
-        input_nodes = set(self._strings)
+        self._double()
+        dsu = self._dsu()
+        input_nodes = set(self._string_nodes())
+        up_in, up_out, down_in, down_out = self._up_in, self._up_out, self._down_in, self._down_out
+        parent, link, add_up, add_down = self._parent, self._link, self._add_up, self._add_down
 
-        for node in nodes:
-            prev = node[:-1]
-            suff = node[1:]
-            prev_suff = node[1:-1]
-
-            while self.graph.has_edge(prev, node) and self.graph.has_edge(node, suff):
-                if self.graph.number_of_edges(prev, node) == 1 and self.graph.number_of_edges(node, suff) == 1:
-                    if node in input_nodes:  # don't make input node isolated
-                        break
+        iterations = 0
+        for node in until(deadline, self._nodes()):
+            # a move replaces prev -> node -> suff with prev -> prev_suff -> suff, it changes neither
+            # the other edges of node nor the DSU, so only the move taking the last pair of edges is checked
+            up, down = up_in[node], down_out[node]
+            moves = min(up, down)
+            if moves and up == down:
+                if node in input_nodes:  # don't make input node isolated
+                    moves -= 1
+                else:
                     node_par = dsu.find_parent(node)
-                    if self.graph.degree(node) != 2 and dsu.last[node_par] == node:
-                        break
+                    if up_out[node] + down_in[node] and dsu.last[node_par] == node:
+                        moves -= 1
 
-                self.graph.remove_edge(prev, node)
-                self.graph.remove_edge(node, suff)
-                if len(node) > 1:
-                    self.graph.add_edge(prev, prev_suff)
-                    self.graph.add_edge(prev_suff, suff)
+            if moves:
+                iterations += moves
+                self._before_move(node)
+                prev, suff = parent(node), link(node)
+                add_up(node, -moves)
+                add_down(node, -moves)
+                if prev != self._root:  # the new edges touch shorter nodes, which are visited later
+                    add_down(prev, moves)
+                    add_up(suff, moves)
+                up, down = up - moves, down - moves
+            else:
+                prev, suff = parent(node), link(node)
 
-            if self.graph.has_edge(prev, node):
+            if up:
                 dsu.union(prev, node)
-            if self.graph.has_edge(node, suff):
+            if down:
                 dsu.union(node, suff)
+        self._stats.count('collapse_iterations', iterations)
 
-    def construct_trivial_graph(self):
+    @timed('trivial_graph')
+    def construct_trivial_graph(self, deadline: Optional[float] = None):
         """
         Constructs a trivial solution by merging input strings
+        :param deadline: perf_counter time after which TimeoutError is raised, the graph is left incomplete then
         """
         cur_overlap = 0
-        for i in range(self._n):
-            cur_string = self._strings[i]
-            for j in range(cur_overlap, len(cur_string)):
-                self.graph.add_edge(cur_string[:j], cur_string[:j + 1])
+        for i, node in enumerate(until(deadline, self._string_nodes())):
+            prefix = node
+            while self._length(prefix) > cur_overlap:
+                self._add_up(prefix)
+                prefix = self._parent(prefix)
 
-            cur_overlap = calculate_overlap(cur_string, self._strings[i + 1]) if i + 1 != len(self._strings) else 0
-            for j in range(len(cur_string), cur_overlap, -1):
-                self.graph.add_edge(cur_string[-j:], '' if j == 1 else cur_string[-j + 1:])
+            cur_overlap = _next_overlap(self._strings, i, self._overlaps)
+            suffix = node
+            while self._length(suffix) > cur_overlap:
+                self._add_down(suffix)
+                suffix = self._link(suffix)
 
-    def construct_greedy_graph(self):
+    @timed('greedy_graph')
+    def construct_greedy_graph(self, deadline: Optional[float] = None):
         """
         Constructs a greedy solution using Greedy Hierarchical Algorithm (GHA)
+        :param deadline: perf_counter time after which TimeoutError is raised, the graph is left incomplete then
         """
-        nodes = list(self.graph.nodes())
-        nodes.sort(key=lambda x: (-len(x), x))
-        dsu = DSU(nodes)
-        nodes.pop()  # remove empty string
+        dsu = self._dsu()
 
-        for string in self._strings:
-            self.graph.add_edge(string[:-1], string)
-            self.graph.add_edge(string, string[1:])
-            dsu.union(string[:-1], string)
-            dsu.union(string, string[1:])
+        for node in until(deadline, self._string_nodes()):
+            self._add_up(node)
+            self._add_down(node)
+            dsu.union(self._parent(node), node)
+            dsu.union(node, self._link(node))
 
-        for node in nodes:
-            if nx.is_isolate(self.graph, node):
+        balancing = 0
+        for node in until(deadline, self._nodes()):
+            if not self._degree(node):
                 continue
-            indegree = sum(self.graph.number_of_edges(vert, node) for vert in self.graph.predecessors(node)
-                           if len(vert) == len(node) + 1)
-            outdegree = sum(self.graph.number_of_edges(node, vert) for vert in self.graph.successors(node)
-                            if len(vert) == len(node) + 1)
+            indegree = self._down_in[node]
+            outdegree = self._up_out[node]
 
+            balancing += abs(indegree - outdegree)
             if indegree > outdegree:
-                suff = node[1:]
-                for _ in range(indegree - outdegree):
-                    self.graph.add_edge(node, suff)
-                dsu.union(node, suff)
+                self._add_down(node, indegree - outdegree)
+                dsu.union(node, self._link(node))
             elif indegree < outdegree:
-                pref = node[:-1]
-                for _ in range(outdegree - indegree):
-                    self.graph.add_edge(pref, node)
-                dsu.union(pref, node)
+                self._add_up(node, outdegree - indegree)
+                dsu.union(self._parent(node), node)
             else:
                 # the last chance to connect eps to node
                 node_par = dsu.find_parent(node)
-                if dsu.find_parent('') != node_par and dsu.last[node_par] == node:
-                    self.graph.add_edge(node[:-1], node)
-                    self.graph.add_edge(node, node[1:])
-                    dsu.union(node[:-1], node)
-                    dsu.union(node, node[1:])
+                if dsu.find_parent(self._root) != node_par and dsu.last[node_par] == node:
+                    self._add_up(node)
+                    self._add_down(node)
+                    dsu.union(self._parent(node), node)
+                    dsu.union(node, self._link(node))
+        self._stats.count('balancing_edges', balancing)
+
+
+class HierarchicalGraph(_HierarchicalAlgorithms):
+    """
+    Hierarchical graph over substring nodes stored as edge multiplicities keyed by the longer end of an edge.
+    A node exists once an edge first touches it
+    """
+    _root = ''
+
+    def __init__(self, strings: List[str], overlaps: Optional[SparseOverlaps] = None,
+                 stats: Optional[Stats] = None):
+        """
+        :param strings: input strings
+        :param overlaps: precomputed overlaps of strings (e.g. an OverlapIndex) used by the trivial solution
+        :param stats: collects the time of the phases and the counts of the operations, nothing by default
+        """
+        self._stats: Stats = stats if stats is not None else NO_STATS
+        self._strings: List[str] = strings
+        self._overlaps: Optional[SparseOverlaps] = overlaps
+        self._n: int = len(strings)
+        # worklist of the algorithms: every node ever touched by an edge, by length
+        self._levels: Dict[int, Set[Node]] = defaultdict(set)
+        # multiplicities of the edges of node going up (node[:-1] -> node -> node + c)
+        # and down (c + node -> node -> node[1:]), _up_in and _down_out are the edges themselves
+        self._up_in: Dict[Node, int] = defaultdict(int)
+        self._up_out: Dict[Node, int] = defaultdict(int)
+        self._down_in: Dict[Node, int] = defaultdict(int)
+        self._down_out: Dict[Node, int] = defaultdict(int)
+
+    @property
+    def graph(self) -> nx.MultiDiGraph:
+        """
+        Current solution as a MultiDiGraph over substrings (only the empty string and non-isolated nodes)
+        """
+        graph = nx.MultiDiGraph()
+        graph.add_node(self._label(self._root))
+        for node, count in self._up_in.items():
+            for _ in range(count):
+                graph.add_edge(self._label(self._parent(node)), self._label(node))
+        for node, count in self._down_out.items():
+            for _ in range(count):
+                graph.add_edge(self._label(node), self._label(self._link(node)))
+        return graph
+
+    def _label(self, node: Node) -> str:
+        """
+        Substring of node
+        """
+        return node
+
+    def _parent(self, node: str) -> str:
+        return node[:-1]
+
+    def _link(self, node: str) -> str:
+        return node[1:]
+
+    def _length(self, node: str) -> int:
+        return len(node)
+
+    def _string_nodes(self) -> List[Node]:
+        return self._strings
+
+    def _add_up(self, node: str, count: int = 1):
+        parent = node[:-1]
+        self._up_in[node] += count
+        self._up_out[parent] += count
+        if count > 0:  # the ends of removed edges are in _levels already
+            self._levels[len(node)].add(node)
+            self._levels[len(parent)].add(parent)
+
+    def _add_down(self, node: str, count: int = 1):
+        link = node[1:]
+        self._down_out[node] += count
+        self._down_in[link] += count
+        if count > 0:
+            self._levels[len(node)].add(node)
+            self._levels[len(link)].add(link)
+
+    def _nodes(self) -> Iterator[Node]:
+        for length in range(max(self._levels, default=0), 0, -1):
+            yield from sorted(self._levels.get(length, ()))
+
+    def _all_nodes(self) -> Iterable[Node]:
+        return chain([self._root], *(level for length, level in self._levels.items() if length))
+
+    def _children(self) -> Callable[[Node], List[Tuple[Node, str]]]:
+        children: Dict[Node, List[Node]] = defaultdict(list)
+        for node, count in self._up_in.items():
+            if count:
+                children[node[:-1]].append(node)
+        return lambda node: sorted(((child, child[-1]) for child in children.get(node, ())), reverse=True)
+
+
+class CompactHierarchicalGraph(_HierarchicalAlgorithms):
+    """
+    Hierarchical graph over integer node ids of a SuffixTrie instead of substring nodes,
+    edge multiplicities fit into flat arrays indexed by the longer end of an edge
+    """
+    _root = 0
+
+    def __init__(self, strings: List[str], overlaps: Optional[SparseOverlaps] = None,
+                 stats: Optional[Stats] = None):
+        """
+        :param strings: input strings
+        :param overlaps: precomputed overlaps of strings (e.g. an OverlapIndex) used by the trivial solution
+        :param stats: collects the time of the phases and the counts of the operations, nothing by default
+        """
+        self._stats: Stats = stats if stats is not None else NO_STATS
+        with self._stats.phase('build_graph'):
+            self.trie = SuffixTrie(strings)
+            self._strings: List[str] = strings
+            self._overlaps: Optional[SparseOverlaps] = overlaps
+            self._n: int = len(strings)
+
+            size = len(self.trie)
+            self._up_in: array = array('i', bytes(4 * size))  # parent[v] -> v
+            self._down_out: array = array('i', bytes(4 * size))  # v -> link[v]
+            self._up_out: array = array('i', bytes(4 * size))  # sum of _up_in over the children of v
+            self._down_in: array = array('i', bytes(4 * size))  # sum of _down_out over the nodes linked to v
+            self._levels: List[array] = self.trie.levels()
+            self._order: array = array('i', bytes(4 * size))  # position in (-len, lexicographic) order
+            for i, node in enumerate(chain(self._nodes(), [0])):
+                self._order[node] = i
+
+    @property
+    def graph(self) -> nx.MultiDiGraph:
+        """
+        Current solution as a MultiDiGraph over substrings (only the empty string and non-isolated nodes)
+        """
+        graph = nx.MultiDiGraph()
+        graph.add_node('')
+        for node in range(1, len(self.trie)):
+            if not self._up_in[node] and not self._down_out[node]:
+                continue
+            label = self.trie.label(node)
+            for _ in range(self._up_in[node]):
+                graph.add_edge(label[:-1], label)
+            for _ in range(self._down_out[node]):
+                graph.add_edge(label, label[1:])
+        return graph
+
+    def _parent(self, node: int) -> int:
+        return self.trie.parent[node]
+
+    def _link(self, node: int) -> int:
+        return self.trie.link[node]
+
+    def _length(self, node: int) -> int:
+        return self.trie.length[node]
+
+    def _string_nodes(self) -> List[int]:
+        return list(map(self.trie.find, self._strings))
+
+    def _nodes(self) -> Iterator[int]:
+        for level in reversed(self._levels[1:]):
+            yield from level
+
+    def _all_nodes(self) -> Iterable[int]:
+        return range(len(self.trie))
+
+    def _children(self) -> Callable[[int], List[Tuple[int, str]]]:
+        return lambda node: [(child, self.trie.char[child]) for child in reversed(self.trie.children(node))]
+
+    def _edge_counts(self) -> Tuple[int, int]:
+        return sum(self._up_in), sum(self._down_out)
+
+    def _dsu(self) -> ArrayDSU:
+        return ArrayDSU(len(self.trie), self._order, self._stats)
+
+    def _double(self):
+        for counts in (self._up_in, self._up_out, self._down_in, self._down_out):
+            for node in range(len(counts)):
+                counts[node] *= 2
+
+    def _add_up(self, node: int, count: int = 1):
+        self._up_in[node] += count
+        self._up_out[self.trie.parent[node]] += count
+
+    def _add_down(self, node: int, count: int = 1):
+        self._down_out[node] += count
+        self._down_in[self.trie.link[node]] += count
+
+
+class UnitigHierarchicalGraph(HierarchicalGraph):
+    """
+    Hierarchical graph whose maximal non-branching chains of substrings are compressed into single edges.
+    Only some substrings are stored: the empty string, the input strings, the strings which are both a proper prefix
+    and a proper suffix of input strings, and the nodes where the stored strings branch as prefixes or as suffixes.
+    The up edge of a node comes from its longest stored proper prefix and spells the rest of the node,
+    the down edge goes to its longest stored proper suffix, and the multiplicity of an edge is the one
+    of every edge of the chain it spans. The other substrings only pass edges through in GHA,
+    and a chain node is stored once a collapsing move touches it, so the graphs are the same as in HierarchicalGraph.
+    CA touches most of the chains, so it gets slower than with HierarchicalGraph,
+    HierarchicalSolver uses it for GHA only
+    """
+    def __init__(self, strings: List[str], overlaps: Optional[SparseOverlaps] = None,
+                 stats: Optional[Stats] = None):
+        """
+        :param strings: input strings
+        :param overlaps: precomputed overlaps of strings (e.g. an OverlapIndex) used by the trivial solution
+        :param stats: collects the time of the phases and the counts of the operations, nothing by default
+        """
+        super().__init__(strings, overlaps, stats)
+        # _levels holds the stored nodes, _up_in and _down_out are the compressed edges
+        self._prefix: Dict[str, str] = {}  # longest stored proper prefix of a stored node
+        self._suffix: Dict[str, str] = {}  # longest stored proper suffix of a stored node
+        self._right: Dict[str, Dict[str, str]] = {'': {}}  # nodes whose _prefix is the key, by their next char
+        self._left: Dict[str, Dict[str, str]] = {'': {}}  # nodes whose _suffix is the key, by their previous char
+
+        with self._stats.phase('build_graph'):
+            automaton = AhoCorasick(strings)
+            for string in strings:
+                self._insert(string)
+                # the fail chain of a string visits all its suffixes which are prefixes of some string
+                node = automaton.fail[automaton.walk(string)]
+                while node:
+                    self._insert(string[-automaton.depth[node]:])
+                    node = automaton.fail[node]
+            self._stats.count('stored_nodes', len(self._prefix))
+
+    @property
+    def graph(self) -> nx.MultiDiGraph:
+        """
+        Current solution as a MultiDiGraph over substrings (only the empty string and non-isolated nodes),
+        the chains are expanded into the edges of single chars
+        """
+        graph = nx.MultiDiGraph()
+        graph.add_node('')
+        for node, count in self._up_in.items():
+            for length in range(len(self._prefix[node]), len(node)) if count else ():
+                for _ in range(count):
+                    graph.add_edge(node[:length], node[:length + 1])
+        for node, count in self._down_out.items():
+            for start in range(len(node) - len(self._suffix[node])) if count else ():
+                for _ in range(count):
+                    graph.add_edge(node[start:], node[start + 1:])
+        return graph
+
+    def _insert(self, node: str, prefix: str = '', suffix: str = ''):
+        """
+        Stores node, it splits the chains passing through it
+        :param prefix: some stored prefix of node to start the search from
+        :param suffix: some stored suffix of node to start the search from
+        """
+        if not node or node in self._prefix:
+            return
+        self._place(node, node[:-1] if node[:-1] in self._prefix else prefix, self._right, self._prefix,
+                    lambda x, depth: x[depth], str.startswith, self._up_in, self._up_out)
+        self._place(node, node[1:] if node[1:] in self._suffix else suffix, self._left, self._suffix,
+                    lambda x, depth: x[-depth - 1], str.endswith, self._down_out, self._down_in)
+        self._levels[len(node)].add(node)
+
+    def _place(self, node: str, parent: str, children: Dict[str, Dict[str, str]], parents: Dict[str, str],
+               key: Callable[[str, int], str], contains: Callable[[str, str], bool],
+               edge: Dict[str, int], edges_out: Dict[str, int]):
+        """
+        Inserts node into the compacted trie of the prefixes or of the suffixes of the stored nodes.
+        If node diverges from a stored node below their common part, the common part is stored first
+        :param parent: stored prefix (suffix) of node to start the search from
+        :param key: char of a string following (preceding) its part of given length
+        :param contains: checks that the first string starts (ends) with the second one
+        :param edge: multiplicities of the edges between the nodes and their parents in the trie
+        :param edges_out: sums of the multiplicities over the children in the trie
+        """
+        while True:
+            child = children[parent].get(key(node, len(parent)))
+            while child is not None and len(child) < len(node) and contains(node, child):
+                parent = child
+                child = children[parent].get(key(node, len(parent)))
+            if child is None or contains(child, node):
+                break
+            common = len(parent)
+            while key(node, common) == key(child, common):
+                common += 1
+            self._insert(node[:common] if contains is str.startswith else node[len(node) - common:])
+
+        parents[node] = parent
+        children[parent][key(node, len(parent))] = node
+        children[node] = {}
+        if child is not None:  # node splits the chain from parent to child
+            parents[child] = node
+            children[node][key(child, len(node))] = child
+            edge[node] = edges_out[node] = edge[child]
+
+    def _parent(self, node: str) -> str:
+        return self._prefix[node]
+
+    def _link(self, node: str) -> str:
+        return self._suffix[node]
+
+    def _children(self) -> Callable[[str], List[Tuple[str, str]]]:
+        return lambda node: [(child, child[len(node):]) for _, child in sorted(self._right[node].items(), reverse=True)]
+
+    def _add_up(self, node: str, count: int = 1):
+        self._up_in[node] += count
+        self._up_out[self._prefix[node]] += count
+
+    def _add_down(self, node: str, count: int = 1):
+        self._down_out[node] += count
+        self._down_in[self._suffix[node]] += count
+
+    def _before_move(self, node: str):
+        # the moved edges are the last ones of the chains, their ends are stored first
+        if len(node) > 1:
+            prev, suff = node[:-1], node[1:]
+            self._insert(prev, self._prefix[node])
+            self._insert(suff, '', self._suffix[node])
+            self._insert(node[1:-1], self._prefix[suff], self._suffix[prev])
+
+    def double_and_collapse(self, deadline: Optional[float] = None):
+        stored = len(self._prefix)
+        try:
+            super().double_and_collapse(deadline)
+        finally:
+            self._stats.count('stored_nodes', len(self._prefix) - stored)
+
+
+class PackedHierarchicalGraph(HierarchicalGraph):
+    """
+    HierarchicalGraph over substrings packed into ints by Packer, 2 bits per char for DNA.
+    The prefix and the suffix of a node are a shift and a mask of its code instead of new strings,
+    nodes are hashed as machine words and take several times less memory than the substrings
+    """
+    _root = 1
+
+    def __init__(self, strings: List[str], overlaps: Optional[SparseOverlaps] = None,
+                 stats: Optional[Stats] = None):
+        """
+        :param strings: input strings
+        :param overlaps: precomputed overlaps of strings (e.g. an OverlapIndex) used by the trivial solution
+        :param stats: collects the time of the phases and the counts of the operations, nothing by default
+        """
+        super().__init__(strings, overlaps, stats)
+        with self._stats.phase('build_graph'):
+            self.packer = Packer(chain.from_iterable(strings))
+            # the levels are keyed by the bit length, which grows with the length of a node
+            self._codes: List[int] = [self.packer.pack(string) for string in strings]
+
+    def _label(self, node: int) -> str:
+        return self.packer.unpack(node)
+
+    def _parent(self, node: int) -> int:
+        return node >> self.packer.bits
+
+    def _link(self, node: int) -> int:
+        return self.packer.suffix(node)
+
+    def _length(self, node: int) -> int:
+        return self.packer.length(node)
+
+    def _string_nodes(self) -> List[int]:
+        return self._codes
+
+    def _add_up(self, node: int, count: int = 1):
+        prefix = node >> self.packer.bits
+        self._up_in[node] += count
+        self._up_out[prefix] += count
+        if count > 0:
+            self._levels[node.bit_length()].add(node)
+            self._levels[prefix.bit_length()].add(prefix)
+
+    def _add_down(self, node: int, count: int = 1):
+        length = node.bit_length() - self.packer.bits
+        top = 1 << length - 1
+        suffix = node & (top - 1) | top  # Packer.suffix inlined
+        self._down_out[node] += count
+        self._down_in[suffix] += count
+        if count > 0:
+            self._levels[length + self.packer.bits].add(node)
+            self._levels[length].add(suffix)
+
+    def _nodes(self) -> Iterator[int]:
+        # codes of equally long strings compare like the strings
+        for length in range(max(self._levels, default=1), 1, -self.packer.bits):
+            yield from sorted(self._levels.get(length, ()))
+
+    def _all_nodes(self) -> Iterable[int]:
+        return chain([self._root], *(level for length, level in self._levels.items() if length > 1))
+
+    def _children(self) -> Callable[[int], List[Tuple[int, str]]]:
+        bits, alphabet = self.packer.bits, self.packer.alphabet
+        mask = (1 << bits) - 1
+        children: Dict[int, List[int]] = defaultdict(list)
+        for node, count in self._up_in.items():
+            if count:
+                children[node >> bits].append(node)
+        return lambda node: [(child, alphabet[child & mask]) for child in sorted(children.get(node, ()), reverse=True)]
+
+    def _dsu(self) -> DSU:
+        return DSU([], key=lambda code: (-code.bit_length(), code), stats=self._stats)
 
 
 class HierarchicalSolver:
-    def __init__(self, strings: List[str]):
-        self.hg = HierarchicalGraph(strings)
+    def __init__(self, strings: List[str], compact: bool = False, overlaps: Optional[SparseOverlaps] = None,
+                 stats: Optional[Stats] = None, unitigs: bool = False, packed: bool = False):
+        """
+        Every algorithm builds a new graph, it is kept in hg afterwards
+        :param strings: input strings
+        :param compact: use CompactHierarchicalGraph instead of the MultiDiGraph over substrings
+        :param overlaps: precomputed overlaps of strings (e.g. an OverlapIndex shared with the other solvers)
+        :param stats: collects the time of the phases and the counts of the operations, nothing by default
+        :param unitigs: use UnitigHierarchicalGraph for GHA, which compresses non-branching chains of long strings.
+        CA keeps the plain graph, it would split most of the chains and get slower than without them
+        :param packed: use PackedHierarchicalGraph, which holds the substrings as packed ints, it suits DNA
+        """
+        if compact + unitigs + packed > 1:
+            raise ValueError('Compact, unitig and packed graphs are mutually exclusive')
+        self._strings: List[str] = strings
+        self._overlaps: Optional[SparseOverlaps] = overlaps
+        self._stats: Optional[Stats] = stats
+        graph_class = (
+            CompactHierarchicalGraph if compact else PackedHierarchicalGraph if packed else HierarchicalGraph
+        )
+        self._graph_classes: Dict[str, type] = {
+            'gha': UnitigHierarchicalGraph if unitigs else graph_class,
+            'trivial_ca': graph_class,
+        }
+        self.hg: Optional[Union[HierarchicalGraph, CompactHierarchicalGraph, PackedHierarchicalGraph]] = None
+
+    def _new_graph(self, algorithm: str):
+        self.hg = self._graph_classes[algorithm](self._strings, self._overlaps, self._stats)
+        return self.hg
 
-    def gha(self) -> str:
+    def _progress(self, superstring: Callable[[], str], done: bool) -> Progress:
+        # the graph is a single walk spelling one char per up edge
+        up, down = self.hg._edge_counts()
+        return Progress(up + down, 1, up, superstring, done)
+
+    def _concatenation(self) -> Progress:
+        strings = self._strings
+        return Progress(0, len(strings), sum(map(len, strings)), lambda: ''.join(strings), False)
+
+    def iter_gha(self, time_budget: Optional[float] = None) -> Iterator[Progress]:
+        """
+        Runs the GHA algorithm phase by phase: the greedy graph is reported once it is built, then its superstring.
+        The edges of the reports are the edges of the graph
+        :param time_budget: stop after this many seconds, the strings are concatenated if the graph is not built then.
+        The eulerian path is not interrupted, it is linear in the size of the graph
+        :return: progress reports, the last one is reported when the algorithm is finished or stopped
+        """
+        deadline = None if time_budget is None else time.perf_counter() + time_budget
+        hg = self._new_graph('gha')
+        try:
+            hg.construct_greedy_graph(deadline)
+        except TimeoutError:
+            yield self._concatenation()
+            return
+        # nothing changes the graph afterwards, so its superstring can be extracted later
+        yield self._progress(hg.to_string, False)
+        superstring = hg.to_string()
+        yield self._progress(lambda: superstring, True)
+
+    def gha(self, time_budget: Optional[float] = None) -> str:
         """
         Solves given SSP instance by using the GHA algorithm
+        :param time_budget: if the time runs out before the graph is built, the strings are concatenated
+        """
+        *_, last = self.iter_gha(time_budget)
+        return last.superstring()
+
+    def iter_trivial_ca(self, time_budget: Optional[float] = None) -> Iterator[Progress]:
+        """
+        Runs the CA algorithm for the trivial solution phase by phase: the trivial graph is reported once it is built,
+        then the collapsed graph and its superstring. The edges of the reports are the edges of the graph
+        :param time_budget: stop after this many seconds, the trivial solution is returned if the graph
+        is not collapsed then and the strings are concatenated if even the trivial graph is not built
+        :return: progress reports, the last one is reported when the algorithm is finished or stopped
         """
-        self.hg.construct_greedy_graph()
-        return self.hg.to_string()
+        deadline = None if time_budget is None else time.perf_counter() + time_budget
+        hg = self._new_graph('trivial_ca')
+        try:
+            hg.construct_trivial_graph(deadline)
+        except TimeoutError:
+            yield self._concatenation()
+            return
+        # the collapse changes the graph, so the trivial solution is merged from the strings
+        trivial = self._progress(partial(_merge, self._strings, self._overlaps), False)
+        yield trivial
+        try:
+            hg.double_and_collapse(deadline)
+        except TimeoutError:
+            yield trivial
+            return
+        yield self._progress(hg.to_string, False)
+        superstring = hg.to_string()
+        yield self._progress(lambda: superstring, True)
 
-    def trivial_ca(self) -> str:
+    def trivial_ca(self, time_budget: Optional[float] = None) -> str:
         """
         Solves given SSP instance by using the CA algorithm for the trivial solution
+        :param time_budget: if the time runs out, the trivial solution is returned, see iter_trivial_ca
         """
-        self.hg.construct_trivial_graph()
-        self.hg.double_and_collapse()
-        return self.hg.to_string()
+        *_, last = self.iter_trivial_ca(time_budget)
+        return last.superstring()
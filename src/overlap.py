@@ -1,3 +1,13 @@
+from array import array
+from collections import defaultdict
+from itertools import chain
+from multiprocessing import Pool
+from operator import itemgetter
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from utils import AhoCorasick, Packer
+
+
 def calculate_overlap(a: str, b: str) -> int:
     """
     Calculates an overlap between two strings using Knuth–Morris–Pratt algorithm
@@ -17,3 +27,151 @@ def calculate_overlap(a: str, b: str) -> int:
         pi[i] = j
 
     return pi[-1]
+
+
+def kmp_overlaps(strings: List[str], rows: Optional[Sequence[int]] = None) -> Iterator[Tuple[int, int, int]]:
+    """
+    Yields (i, j, overlap) for all the pairs with nonzero overlap by running KMP on every pair
+    :param rows: compute only the overlaps of these strings with the others, all by default
+    """
+    for i in range(len(strings)) if rows is None else rows:
+        for j in range(len(strings)):
+            if i != j:
+                overlap = calculate_overlap(strings[i], strings[j])
+                if overlap:
+                    yield i, j, overlap
+
+
+def aho_corasick_overlaps(strings: List[str],
+                          rows: Optional[Sequence[int]] = None) -> Iterator[Tuple[int, int, int]]:
+    """
+    Yields (i, j, overlap) for all the pairs with nonzero overlap in O(total length + n^2)
+    using Gusfield's all-pairs suffix-prefix algorithm over the Aho–Corasick trie:
+    every trie node which is a suffix of strings[i] is marked with i, then a DFS over the trie
+    keeps the deepest marked ancestor for each i and reports it at every terminal node
+    :param rows: compute only the overlaps of these strings with the others, all by default
+    """
+    ac = AhoCorasick(strings)
+    marks: Dict[int, List[int]] = {}
+    for i in range(len(strings)) if rows is None else rows:
+        node = ac.walk(strings[i])
+        while node:
+            marks.setdefault(node, []).append(i)
+            node = ac.fail[node]
+
+    active: Dict[int, List[int]] = {}  # i -> depths of the marked nodes on the current DFS path
+    stack = [0]
+    while stack:
+        node = stack.pop()
+        if node < 0:  # leaving the subtree
+            for i in marks.get(~node, ()):
+                depths = active[i]
+                depths.pop()
+                if not depths:
+                    del active[i]
+            continue
+
+        stack.append(~node)
+        for i in marks.get(node, ()):
+            active.setdefault(i, []).append(ac.depth[node])
+        for j in ac.ends.get(node, ()):
+            for i, depths in active.items():
+                if i != j:
+                    yield i, j, depths[-1]
+        stack.extend(ac.children[node].values())
+
+
+def numpy_overlaps(strings: List[str], rows: Optional[Sequence[int]] = None) -> Iterator[Tuple[int, int, int]]:
+    """
+    Yields (i, j, overlap) for all the pairs with nonzero overlap from the vectorised overlap matrix,
+    see src.overlap_numpy.overlap_matrix. Requires numpy
+    :param rows: compute only the overlaps of these strings with the others, all by default
+    """
+    from .overlap_numpy import overlap_matrix  # numpy is an optional dependency
+
+    if not strings:
+        return
+    matrix = overlap_matrix(strings, rows)
+    positions, heads = matrix.nonzero()
+    values = matrix[positions, heads].tolist()
+    tails = positions.tolist() if rows is None else [rows[p] for p in positions.tolist()]
+    yield from zip(tails, heads.tolist(), values)
+
+
+def packed_overlaps(strings: List[str], rows: Optional[Sequence[int]] = None) -> Iterator[Tuple[int, int, int]]:
+    """
+    Yields (i, j, overlap) for all the pairs with nonzero overlap in O(total length + n^2) dict lookups.
+    Strings are packed by Packer (2 bits per char for DNA), the packed prefixes of every length are hashed,
+    and every packed suffix of strings[i] is looked up among them, so chars are compared by whole words
+    :param rows: compute only the overlaps of these strings with the others, all by default
+    """
+    packer = Packer(chain.from_iterable(strings))
+    bits = packer.bits
+    codes = [packer.pack(string) for string in strings]
+    starting: Dict[int, List[int]] = defaultdict(list)  # packed prefix -> strings starting with it
+    for j, code in enumerate(codes):
+        for shift in range(0, bits * len(strings[j]), bits):
+            starting[code >> shift].append(j)
+
+    for i in range(len(strings)) if rows is None else rows:
+        code, overlaps = codes[i], {}
+        for length in range(1, len(strings[i]) + 1):  # the longest overlap is written last
+            top = 1 << bits * length
+            for j in starting.get(code & (top - 1) | top, ()):
+                overlaps[j] = length
+        overlaps.pop(i, None)
+        for j, overlap in overlaps.items():
+            yield i, j, overlap
+
+
+OVERLAP_BACKENDS: Dict[str, Callable[[List[str], Optional[Sequence[int]]], Iterator[Tuple[int, int, int]]]] = {
+    'aho_corasick': aho_corasick_overlaps,
+    'kmp': kmp_overlaps,
+    'numpy': numpy_overlaps,
+    'packed': packed_overlaps,
+}
+
+_worker_strings: List[str] = []
+_worker_backend: str = ''
+
+
+def _init_worker(strings: List[str], backend: str):
+    global _worker_strings, _worker_backend
+    _worker_strings, _worker_backend = strings, backend
+
+
+def _overlap_rows(rows: range) -> Tuple[array, array, array]:
+    """
+    Computes the overlaps of the given rows in a pool worker, they are returned as packed int arrays
+    """
+    triples = list(OVERLAP_BACKENDS[_worker_backend](_worker_strings, rows))
+    return array('i', map(itemgetter(0), triples)), array('i', map(itemgetter(1), triples)), \
+        array('i', map(itemgetter(2), triples))
+
+
+def _parallel_overlaps(strings: List[str], backend: str, workers: int) -> Iterator[Tuple[int, int, int]]:
+    """
+    Splits the rows into contiguous blocks and computes them in a process pool.
+    Blocks are yielded in order, so the output depends only on the number of workers, and the set
+    of overlaps doesn't depend on it at all
+    """
+    n = len(strings)
+    size = -(-n // workers)  # one block per worker: every block rebuilds the automaton of the whole instance
+    blocks = [range(lo, min(n, lo + size)) for lo in range(0, n, size)]
+    with Pool(workers, _init_worker, (strings, backend)) as pool:
+        for rows, columns, values in pool.imap(_overlap_rows, blocks):
+            yield from zip(rows, columns, values)
+
+
+def all_overlaps(strings: List[str], backend: str = 'aho_corasick', workers: int = 1) -> Iterator[Tuple[int, int, int]]:
+    """
+    Yields (i, j, overlap) for all the pairs i != j with nonzero overlap
+    :param strings: list of strings
+    :param backend: name of the engine from OVERLAP_BACKENDS
+    :param workers: number of processes computing the rows of the overlap matrix
+    """
+    if backend not in OVERLAP_BACKENDS:
+        raise ValueError(f'Unknown overlap backend {backend}')
+    if workers > 1 and len(strings) > 1:
+        return _parallel_overlaps(strings, backend, workers)
+    return OVERLAP_BACKENDS[backend](strings)
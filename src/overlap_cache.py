@@ -0,0 +1,160 @@
+import glob
+import hashlib
+import mmap
+import os
+import struct
+from array import array
+from typing import Iterable, List, Optional, Tuple
+
+from .sparse import SparseOverlaps
+
+_HEADER = struct.Struct('=8sqq')  # magic, number of strings, number of stored overlaps
+_MAGIC = b'SSPOVL2\0'
+_SUFFIX = '.ovl'
+
+
+class OverlapCache:
+    """
+    Directory of overlap graphs stored as memory-mappable CSR files, one file per instance.
+    Rows and columns in a file follow the order of the strings of the instance it was stored for,
+    so a hit on the same list is mapped without copying. A file is named by the hash of the multiset of
+    the strings and the hash of their order, and it also holds the rank of every string in the sorted order,
+    so a permutation of a stored instance still hits, at the cost of rebuilding the CSR.
+    The least recently used files are evicted once the directory exceeds the configured limits
+    """
+    def __init__(self, directory: str, max_bytes: Optional[int] = None, max_entries: Optional[int] = None):
+        """
+        :param directory: cache directory, created if missing
+        :param max_bytes: limit of the total size of the cached files
+        :param max_entries: limit of the number of the cached files
+        """
+        self.directory: str = directory
+        self.max_bytes: Optional[int] = max_bytes
+        self.max_entries: Optional[int] = max_entries
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def _hash(strings: Iterable[str]) -> str:
+        digest = hashlib.sha256()
+        for string in strings:
+            data = string.encode('utf-8', 'surrogatepass')
+            digest.update(len(data).to_bytes(8, 'little'))
+            digest.update(data)
+        return digest.hexdigest()
+
+    @staticmethod
+    def key(strings: List[str]) -> str:
+        """
+        Content hash of the multiset of strings
+        """
+        return OverlapCache._hash(sorted(strings))
+
+    def path(self, strings: List[str]) -> str:
+        """
+        File of the overlaps of strings in their own order
+        """
+        return os.path.join(self.directory, f'{self.key(strings)}-{self._hash(strings)}{_SUFFIX}')
+
+    @staticmethod
+    def _ranks(strings: List[str]) -> List[int]:
+        """
+        Position of every string in the stably sorted order
+        """
+        rank = [0] * len(strings)
+        for i, j in enumerate(sorted(range(len(strings)), key=strings.__getitem__)):
+            rank[j] = i
+        return rank
+
+    def _map(self, path: str, n: int) -> Optional[Tuple[mmap.mmap, int]]:
+        """
+        Maps the file and marks it as recently used
+        :return: the mapping and the number of stored overlaps, None if the file is missing, corrupted
+        or belongs to an instance of another size
+        """
+        try:
+            with open(path, 'rb') as file:
+                mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):  # missing or empty file
+            return None
+        try:
+            os.utime(path)
+        except OSError:  # read-only cache or evicted concurrently, the mapping is still valid
+            pass
+
+        magic, stored, nonzero = _HEADER.unpack_from(mapping) if len(mapping) >= _HEADER.size else (None, 0, 0)
+        if magic != _MAGIC or stored != n or len(mapping) != _HEADER.size + 8 * (n + 1 + nonzero) + 4 * n:
+            mapping.close()
+            return None
+        return mapping, nonzero
+
+    def load(self, strings: List[str]) -> Optional[SparseOverlaps]:
+        """
+        Looks up the overlaps of strings and marks the file as recently used
+        :return: overlaps indexed by positions in strings, mapped from the file without copying if they were
+        stored for the same order of strings, None if the instance is not cached
+        """
+        n = len(strings)
+        found = self._map(self.path(strings), n)
+        if found is not None:
+            mapping, nonzero = found
+            return SparseOverlaps.from_buffer(n, nonzero, memoryview(mapping)[_HEADER.size:])
+
+        # the same multiset stored in another order, its rows and columns are renumbered through the sorted order
+        # and the result is stored for this order, so the next hit is mapped
+        for other in glob.glob(os.path.join(glob.escape(self.directory), f'{self.key(strings)}-*{_SUFFIX}')):
+            found = self._map(other, n)
+            if found is None:
+                continue
+            mapping, nonzero = found
+            data = memoryview(mapping[_HEADER.size:])  # copied, so the file can be closed right away
+            mapping.close()
+            stored = SparseOverlaps.from_buffer(n, nonzero, data)
+            stored_ranks = data[8 * (n + 1 + nonzero):].cast('i')
+
+            position = [0] * n
+            for i, rank in enumerate(self._ranks(strings)):
+                position[rank] = i
+            overlaps = stored.renumbered([position[rank] for rank in stored_ranks])
+            try:
+                self.store(strings, overlaps)
+            except OSError:  # read-only cache
+                pass
+            return overlaps
+        return None
+
+    def store(self, strings: List[str], overlaps: SparseOverlaps):
+        """
+        Writes the overlaps of strings to the cache and evicts the least recently used files if needed
+        :param overlaps: overlaps indexed by positions in strings
+        """
+        path = self.path(strings)
+        temporary = f'{path}.{os.getpid()}.tmp'
+        with open(temporary, 'wb') as file:
+            file.write(_HEADER.pack(_MAGIC, len(strings), len(overlaps)))
+            file.write(overlaps.tobytes())
+            file.write(array('i', self._ranks(strings)).tobytes())
+        os.replace(temporary, path)  # readers never see a partially written file
+        self.evict()
+
+    def evict(self):
+        """
+        Removes the least recently used files until the cache fits into the limits
+        """
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(_SUFFIX):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.path, stat.st_size))
+        entries.sort()
+
+        total = sum(size for _, _, size in entries)
+        for count, (_, path, size) in zip(range(len(entries), 0, -1), entries):
+            if (self.max_bytes is None or total <= self.max_bytes) and (
+                    self.max_entries is None or count <= self.max_entries
+            ):
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:  # evicted concurrently
+                pass
+            total -= size
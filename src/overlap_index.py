@@ -0,0 +1,87 @@
+from multiprocessing import shared_memory
+from typing import List, Optional
+
+from .overlap import all_overlaps
+from .overlap_cache import OverlapCache
+from .sparse import SparseOverlaps
+
+
+class OverlapIndex(SparseOverlaps):
+    """
+    Nonzero overlaps of all the pairs of given strings, computed once and reused by every solver of a run.
+    After share() the CSR arrays are copied into a shared memory block and pickled copies of the index
+    (e.g. sent to pool workers) carry only the name of the block and map the arrays from it instead of copying them
+    """
+    def __init__(self, strings: List[str], overlap_backend: str = 'aho_corasick',
+                 cache: Optional[OverlapCache] = None, workers: int = 1):
+        """
+        :param strings: input strings, solvers using the index must get the same list
+        :param overlap_backend: engine used to compute pairwise overlaps, see src.overlap.OVERLAP_BACKENDS
+        :param cache: on-disk cache to load the overlaps from, they are computed and stored there on a miss
+        :param workers: number of processes computing the overlaps
+        """
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self._owner: bool = False
+        self.strings: List[str] = strings
+
+        cached = cache.load(strings) if cache is not None else None
+        if cached is not None:
+            self._n = len(strings)
+            self.indptr, self.indices, self.values = cached.indptr, cached.indices, cached.values
+            return
+        super().__init__(len(strings), all_overlaps(strings, overlap_backend, workers))
+        if cache is not None:
+            cache.store(strings, self)
+
+    def share(self) -> 'OverlapIndex':
+        """
+        Copies the arrays into a new shared memory block, it lives until unlink() is called
+        """
+        if self._shm is None:
+            data = self.tobytes()
+            self._shm = shared_memory.SharedMemory(create=True, size=max(1, len(data)))
+            self._owner = True
+            self._shm.buf[:len(data)] = data
+        return self
+
+    def close(self):
+        """
+        Detaches from the shared memory block and the cache file,
+        the arrays mapped from them are not usable anymore
+        """
+        for data in (self.indptr, self.indices, self.values):
+            if isinstance(data, memoryview):
+                data.release()
+        if self._shm is not None:
+            self._shm.close()
+            self._shm = None
+
+    def unlink(self):
+        """
+        Detaches from the shared memory block and frees it, must be called once by the process that shared the index
+        """
+        shm, owner = self._shm, self._owner
+        self.close()
+        if shm is not None and owner:
+            shm.unlink()
+
+    def __del__(self):
+        if hasattr(self, 'indptr'):
+            self.close()
+
+    def __getstate__(self):
+        state = {'strings': self.strings, 'n': self._n, 'nonzero': len(self)}
+        if self._shm is not None:
+            state['name'] = self._shm.name
+        else:  # not shared, the arrays are pickled by value
+            state['data'] = self.tobytes()
+        return state
+
+    def __setstate__(self, state):
+        self.strings, self._owner = state['strings'], False
+        if 'name' in state:
+            self._shm = shared_memory.SharedMemory(name=state['name'])
+            self._map(state['n'], state['nonzero'], self._shm.buf)
+        else:
+            self._shm = None
+            self._map(state['n'], state['nonzero'], memoryview(state['data']))
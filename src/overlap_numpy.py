@@ -0,0 +1,99 @@
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+_BASE = np.uint64(0x9E3779B97F4A7C15)  # odd multiplier of the polynomial hash modulo 2^64
+_CHUNK = 1 << 22  # max number of compared chars held in memory at once
+
+
+def _encode(strings: List[str]):
+    """
+    :return: code points of all the strings concatenated, offsets and lengths of the strings
+    """
+    lengths = np.fromiter(map(len, strings), dtype=np.int64, count=len(strings))
+    offsets = np.zeros(len(strings), dtype=np.int64)
+    np.cumsum(lengths[:-1], out=offsets[1:])
+    codes = np.frombuffer(''.join(strings).encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+    return codes.astype(np.uint64), offsets, lengths
+
+
+def _prefix_hashes(codes, offsets, lengths):
+    """
+    :return: (n, max length + 1) matrix of the hashes of all the prefixes, rows are padded with the full hash
+    """
+    n, width = len(lengths), int(lengths.max(initial=0))
+    hashes = np.zeros((n, width + 1), dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        for p in range(width):
+            present = lengths > p
+            hashes[:, p + 1] = hashes[:, p]
+            hashes[present, p + 1] = hashes[present, p] * _BASE + codes[offsets[present] + p] + np.uint64(1)
+    return hashes
+
+
+def _verify(codes, offsets, lengths, tails, heads, k: int):
+    """
+    Checks that the suffix of length k of every tail equals the prefix of length k of the matching head
+    """
+    result = np.empty(len(tails), dtype=bool)
+    step = max(1, _CHUNK // k)
+    shift = np.arange(k, dtype=np.int64)
+    for lo in range(0, len(tails), step):
+        i, j = tails[lo:lo + step], heads[lo:lo + step]
+        suffixes = codes[(offsets[i] + lengths[i] - k)[:, None] + shift]
+        prefixes = codes[offsets[j][:, None] + shift]
+        result[lo:lo + step] = (suffixes == prefixes).all(axis=1)
+    return result
+
+
+def overlap_matrix(strings: List[str], rows: Optional[Sequence[int]] = None) -> np.ndarray:
+    """
+    Calculates overlaps of all the pairs at once. For every length k, from the longest one down,
+    the suffixes of length k are matched with the prefixes of length k by their rolling hashes,
+    the candidates are verified char by char, and a pair keeps the first (longest) verified k.
+    The work is vectorised over the pairs, which suits the reads of the same length best
+    :param rows: compute only the overlaps of these strings with the others, all by default
+    :return: matrix of the overlaps of rows with all the strings, zero on the diagonal
+    """
+    n = len(strings)
+    rows = np.arange(n, dtype=np.int64) if rows is None else np.asarray(rows, dtype=np.int64).reshape(-1)
+    codes, offsets, lengths = _encode(strings)
+    hashes = _prefix_hashes(codes, offsets, lengths)
+    width = hashes.shape[1] - 1
+    powers = np.ones(width + 1, dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        for k in range(width):
+            powers[k + 1] = powers[k] * _BASE
+
+    result = np.zeros((len(rows), n), dtype=np.min_scalar_type(width))
+    position = np.full(n, -1, dtype=np.int64)  # position of a string in rows
+    position[rows] = np.arange(len(rows))
+    for k in range(width, 0, -1):
+        tails = rows[lengths[rows] >= k]
+        heads = np.flatnonzero(lengths >= k)
+        if not len(tails) or not len(heads):
+            continue
+        with np.errstate(over='ignore'):
+            suffixes = hashes[tails, lengths[tails]] - hashes[tails, lengths[tails] - k] * powers[k]
+        prefixes = hashes[heads, k]
+
+        # all the (tail, head) pairs with equal hashes
+        order = np.argsort(prefixes, kind='stable')
+        prefixes, heads = prefixes[order], heads[order]
+        left = np.searchsorted(prefixes, suffixes, 'left')
+        counts = np.searchsorted(prefixes, suffixes, 'right') - left
+        ends = np.cumsum(counts)
+        lo = 0
+        while lo < len(tails):  # blocks of tails with about _CHUNK pairs in total
+            hi = max(lo + 1, int(np.searchsorted(ends, ends[lo] - counts[lo] + _CHUNK, 'right')))
+            block_counts = counts[lo:hi]
+            pair_tails = np.repeat(tails[lo:hi], block_counts)
+            starts = np.repeat(left[lo:hi] - (np.cumsum(block_counts) - block_counts), block_counts)
+            pair_heads = heads[starts + np.arange(len(pair_tails))]
+
+            keep = (pair_tails != pair_heads) & (result[position[pair_tails], pair_heads] == 0)
+            pair_tails, pair_heads = pair_tails[keep], pair_heads[keep]
+            keep = _verify(codes, offsets, lengths, pair_tails, pair_heads, k)
+            result[position[pair_tails[keep]], pair_heads[keep]] = k
+            lo = hi
+    return result
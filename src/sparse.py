@@ -0,0 +1,145 @@
+from array import array
+from bisect import bisect_left
+from typing import Iterable, Iterator, Optional, Sequence, Tuple
+
+from utils import bucket_sort_edges
+
+
+class SparseOverlaps:
+    """
+    Overlap graph in CSR form: only nonzero overlaps are stored as parallel int arrays,
+    row i occupies indices[indptr[i]:indptr[i + 1]] (sorted by column) and the matching slice of values.
+    Missing pairs have zero overlap
+    """
+    def __init__(self, n: int, triples: Iterable[Tuple[int, int, int]], top_k: Optional[int] = None):
+        """
+        :param n: number of strings
+        :param triples: (i, j, overlap) for the nonzero overlaps, in any order
+        :param top_k: if given, only the k largest overlaps of every row are kept (ties go to smaller j)
+        """
+        self._n: int = n
+        rows, cols, vals = array('i'), array('i'), array('i')
+        for i, j, overlap in triples:
+            rows.append(i)
+            cols.append(j)
+            vals.append(overlap)
+
+        # counting sort by row, then sort every row separately
+        order = array('q', bytes(8 * (n + 1)))
+        for i in rows:
+            order[i + 1] += 1
+        for i in range(n):
+            order[i + 1] += order[i]
+        position = array('q', order)
+        unordered_cols, unordered_vals = array('i', bytes(4 * len(rows))), array('i', bytes(4 * len(rows)))
+        for i, j, overlap in zip(rows, cols, vals):
+            unordered_cols[position[i]] = j
+            unordered_vals[position[i]] = overlap
+            position[i] += 1
+        del rows, cols, vals, position
+
+        self.indptr: array = array('q', [0])
+        self.indices: array = array('i')
+        self.values: array = array('i')
+        for i in range(n):
+            row = sorted(zip(unordered_cols[order[i]:order[i + 1]], unordered_vals[order[i]:order[i + 1]]))
+            if top_k is not None:
+                row = sorted(sorted(row, key=lambda x: (-x[1], x[0]))[:top_k])
+            for j, overlap in row:
+                self.indices.append(j)
+                self.values.append(overlap)
+            self.indptr.append(len(self.indices))
+
+    @classmethod
+    def from_buffer(cls, n: int, nonzero: int, buffer: memoryview) -> 'SparseOverlaps':
+        """
+        Maps the arrays laid out by tobytes() in buffer without copying them
+        :param n: number of strings
+        :param nonzero: number of stored overlaps
+        """
+        overlaps = cls.__new__(cls)
+        overlaps._map(n, nonzero, buffer)
+        return overlaps
+
+    def _map(self, n: int, nonzero: int, buffer: memoryview):
+        rows = 8 * (n + 1)
+        self._n = n
+        self.indptr = buffer[:rows].cast('q')
+        self.indices = buffer[rows:rows + 4 * nonzero].cast('i')
+        self.values = buffer[rows + 4 * nonzero:rows + 8 * nonzero].cast('i')
+
+    def renumbered(self, position: Sequence[int]) -> 'SparseOverlaps':
+        """
+        Copy of the overlaps with string i moved to position[i], the arrays are permuted as a whole
+        with numpy if it is installed, row by row otherwise
+        :param position: permutation of range(n)
+        """
+        overlaps = SparseOverlaps.__new__(SparseOverlaps)
+        overlaps._n = self._n
+        try:
+            import numpy as np  # numpy is an optional dependency
+        except ImportError:
+            np = None
+
+        if np is not None:
+            position_ = np.asarray(position, dtype=np.int64)
+            indptr = np.frombuffer(self.indptr, dtype=np.int64)
+            rows = position_[np.repeat(np.arange(self._n), np.diff(indptr))]
+            cols = position_[np.frombuffer(self.indices, dtype=np.int32)]
+            order = np.lexsort((cols, rows))
+            counts = np.zeros(self._n + 1, dtype=np.int64)
+            np.cumsum(np.bincount(rows, minlength=self._n), out=counts[1:])
+            overlaps.indptr = array('q', counts.tobytes())
+            overlaps.indices = array('i', cols[order].astype(np.int32).tobytes())
+            overlaps.values = array('i', np.frombuffer(self.values, dtype=np.int32)[order].tobytes())
+            return overlaps
+
+        source = [0] * self._n
+        for i, p in enumerate(position):
+            source[p] = i
+        overlaps.indptr, overlaps.indices, overlaps.values = array('q', [0]), array('i'), array('i')
+        for i in source:
+            lo, hi = self.indptr[i], self.indptr[i + 1]
+            row = sorted(zip(map(position.__getitem__, self.indices[lo:hi]), self.values[lo:hi]))
+            overlaps.indices.extend(j for j, _ in row)
+            overlaps.values.extend(overlap for _, overlap in row)
+            overlaps.indptr.append(len(overlaps.indices))
+        return overlaps
+
+    def tobytes(self) -> bytes:
+        """
+        Serializes indptr, indices and values one after another in the native byte order
+        """
+        return self.indptr.tobytes() + self.indices.tobytes() + self.values.tobytes()
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __getitem__(self, edge: Tuple[int, int]) -> int:
+        i, j = edge
+        lo, hi = self.indptr[i], self.indptr[i + 1]
+        pos = bisect_left(self.indices, j, lo, hi)
+        if pos < hi and self.indices[pos] == j:
+            return self.values[pos]
+        return 0
+
+    def items(self) -> Iterator[Tuple[Tuple[int, int], int]]:
+        """
+        Yields ((i, j), overlap) for all the stored edges in lexicographic order
+        """
+        for i in range(self._n):
+            for pos in range(self.indptr[i], self.indptr[i + 1]):
+                yield (i, self.indices[pos]), self.values[pos]
+
+    def triples(self) -> Iterator[Tuple[int, int, int]]:
+        """
+        Yields (i, j, overlap) for all the stored edges in lexicographic order
+        """
+        for (i, j), overlap in self.items():
+            yield i, j, overlap
+
+    def edges(self) -> Iterator[Tuple[int, int]]:
+        """
+        Yields all the stored edges in descending order of overlap, ties are broken lexicographically
+        """
+        return bucket_sort_edges(self._n, self.items())
@@ -0,0 +1,125 @@
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from typing import Callable, ContextManager, Dict, Iterable, Iterator, List, Optional, TypeVar
+
+Method = TypeVar('Method', bound=Callable)
+
+CLOCK_STEPS = 1024  # the clock is checked once per this many items by until
+
+
+class PhaseStats:
+    def __init__(self):
+        self.time: float = 0.0  # total wall time, seconds
+        self.calls: int = 0
+        self.peak_memory: int = 0  # max of the traced memory peaks over the calls, bytes
+
+
+class Stats:
+    """
+    Per-phase wall time, number of calls and peak memory plus named counters of internal operations.
+    A disabled instance ignores everything, so the solvers always have an instance to report to
+    and pay only for an attribute lookup and a no-op call per phase when profiling is off
+    """
+    def __init__(self, enabled: bool = True, memory: bool = False):
+        """
+        :param enabled: record anything at all
+        :param memory: trace the peak memory of the phases with tracemalloc, which slows the code down noticeably
+        """
+        self.enabled: bool = enabled
+        self.memory: bool = enabled and memory
+        self.phases: Dict[str, PhaseStats] = defaultdict(PhaseStats)
+        self.counters: Dict[str, int] = defaultdict(int)
+        self._peaks: List[int] = []  # traced peaks of the open phases, the innermost one is the last
+        self._tracing: bool = self.memory and not tracemalloc.is_tracing()  # the tracing was started here
+        if self._tracing:
+            tracemalloc.start()
+
+    def phase(self, name: str) -> ContextManager:
+        """
+        Context manager recording a call of the phase, nested phases are recorded separately
+        """
+        if not self.enabled:
+            return nullcontext()
+        return self._phase(name)
+
+    @contextmanager
+    def _phase(self, name: str) -> Iterator[None]:
+        if self.memory:
+            if self._peaks:  # the peak so far belongs to the enclosing phase
+                self._peaks[-1] = max(self._peaks[-1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            self._peaks.append(0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            phase = self.phases[name]
+            phase.time += time.perf_counter() - start
+            phase.calls += 1
+            if self.memory:
+                peak = max(self._peaks.pop(), tracemalloc.get_traced_memory()[1])
+                phase.peak_memory = max(phase.peak_memory, peak)
+                if self._peaks:
+                    self._peaks[-1] = max(self._peaks[-1], peak)
+
+    def stop(self):
+        """
+        Stops the memory tracing if it was started by this instance, the collected stats are kept
+        """
+        if self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+
+    def count(self, name: str, value: int = 1):
+        if self.enabled:
+            self.counters[name] += value
+
+    def as_dict(self) -> Dict:
+        return {
+            'phases': {name: vars(phase).copy() for name, phase in self.phases.items()},
+            'counters': dict(self.counters),
+        }
+
+    def report(self) -> str:
+        """
+        Human readable table of the phases and the counters
+        """
+        lines = [
+            f'{name}: {phase.time:.3f}s, {phase.calls} calls' +
+            (f', peak {phase.peak_memory / 2 ** 20:.1f} MiB' if self.memory else '')
+            for name, phase in self.phases.items()
+        ]
+        lines.extend(f'{name}: {value}' for name, value in self.counters.items())
+        return '\n'.join(lines)
+
+
+NO_STATS = Stats(enabled=False)
+
+
+def timed(name: str) -> Callable[[Method], Method]:
+    """
+    Records every call of the method as the phase of self._stats
+    """
+    def decorator(method: Method) -> Method:
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self._stats.phase(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def until(deadline: Optional[float], iterable: Iterable) -> Iterator:
+    """
+    Passes the items through, raises TimeoutError once the deadline (perf_counter time) passes
+    """
+    if deadline is None:
+        yield from iterable
+        return
+    for step, item in enumerate(iterable):
+        if step % CLOCK_STEPS == 0 and time.perf_counter() > deadline:
+            raise TimeoutError
+        yield item
@@ -0,0 +1,107 @@
+from array import array
+from typing import List
+
+
+class SuffixTrie:
+    """
+    Trie of all the substrings of given strings, every node is a distinct substring encoded by an integer id.
+    All the data is kept in flat arrays: parent[v] is v without its last char, link[v] is v without its first char,
+    children of every node form a linked list sorted by char. Node 0 is the empty string
+    """
+    def __init__(self, strings: List[str]):
+        self.parent: array = array('i', [0])
+        self.link: array = array('i', [0])
+        self.length: array = array('i', [0])
+        self.char: array = array('u', '\0')
+        self._first_child: array = array('i', [-1])
+        self._next_sibling: array = array('i', [-1])
+
+        for string in strings:
+            for start in range(len(string)):
+                node = 0
+                for pos in range(start, len(string)):
+                    node = self._get_or_add_child(node, string[pos])
+
+        # parents are always created before their children, and v[1:] is a substring as well
+        for node in range(1, len(self)):
+            parent = self.parent[node]
+            self.link[node] = self.child(self.link[parent], self.char[node]) if parent else 0
+
+    def __len__(self) -> int:
+        return len(self.parent)
+
+    def child(self, node: int, char: str) -> int:
+        """
+        :return: id of node + char or -1 if there is no such node
+        """
+        child = self._first_child[node]
+        while child != -1 and self.char[child] < char:
+            child = self._next_sibling[child]
+        return child if child != -1 and self.char[child] == char else -1
+
+    def children(self, node: int) -> List[int]:
+        """
+        :return: ids of all one char extensions of node in lexicographic order
+        """
+        result = []
+        child = self._first_child[node]
+        while child != -1:
+            result.append(child)
+            child = self._next_sibling[child]
+        return result
+
+    def _get_or_add_child(self, node: int, char: str) -> int:
+        prev, child = -1, self._first_child[node]
+        while child != -1 and self.char[child] < char:
+            prev, child = child, self._next_sibling[child]
+        if child != -1 and self.char[child] == char:
+            return child
+
+        new = len(self)
+        self.parent.append(node)
+        self.link.append(0)
+        self.length.append(self.length[node] + 1)
+        self.char.append(char)
+        self._first_child.append(-1)
+        self._next_sibling.append(child)
+        if prev == -1:
+            self._first_child[node] = new
+        else:
+            self._next_sibling[prev] = new
+        return new
+
+    def find(self, string: str) -> int:
+        """
+        :return: id of given substring or -1 if it is not in the trie
+        """
+        node = 0
+        for char in string:
+            node = self.child(node, char)
+            if node == -1:
+                break
+        return node
+
+    def label(self, node: int) -> str:
+        """
+        :return: substring encoded by node
+        """
+        chars = []
+        while node:
+            chars.append(self.char[node])
+            node = self.parent[node]
+        return ''.join(reversed(chars))
+
+    def levels(self) -> List[array]:
+        """
+        :return: ids of nodes grouped by length, every group is sorted lexicographically
+        """
+        levels = []
+        stack = [0]
+        while stack:  # preorder DFS with sorted children visits nodes in lexicographic order
+            node = stack.pop()
+            length = self.length[node]
+            if length == len(levels):
+                levels.append(array('i'))
+            levels[length].append(node)
+            stack.extend(reversed(self.children(node)))
+        return levels
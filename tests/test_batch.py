@@ -0,0 +1,85 @@
+import pytest
+
+from src import (ALGORITHMS, GreedySolver, HierarchicalGraph, HierarchicalSolver, UnitigHierarchicalGraph, graph_digest,
+                 solve_many)
+
+instances = [
+    ['abc', 'bcd', 'cde'],
+    ['CGGGG', 'GGGGT', 'GCAAC', 'CTGCT', 'CTCCG', 'TTTAG', 'GGGGG', 'AGACG', 'CGGGC'],
+    ['ab'],
+    ['aaab', 'abbb', 'bbba', 'baaa'],
+]
+
+
+def expected_superstring(strings, algorithm):
+    if algorithm in ('greedy', 't_greedy'):
+        return getattr(GreedySolver(strings), algorithm)()
+    return getattr(HierarchicalSolver(strings), algorithm)()
+
+
+@pytest.mark.parametrize('workers', [1, 3])
+def test_solve_many(workers):
+    results = list(solve_many(instances, workers=workers))
+    assert sorted((result.instance, result.algorithm) for result in results) == sorted(
+        (instance, algorithm) for instance in range(len(instances)) for algorithm in ALGORITHMS
+    )
+    for result in results:
+        assert result.superstring == expected_superstring(instances[result.instance], result.algorithm)
+
+
+def test_shards_cover_all_jobs():
+    jobs = []
+    for index in range(3):
+        jobs.extend((result.instance, result.algorithm) for result in solve_many(instances, ['greedy', 'gha'],
+                                                                                 shard=(index, 3)))
+    assert sorted(jobs) == sorted((instance, algorithm) for instance in range(len(instances))
+                                  for algorithm in ['greedy', 'gha'])
+
+
+def test_largest_first():
+    results = list(solve_many(instances, ['greedy']))
+    assert [result.instance for result in results] == [1, 3, 0, 2]
+
+
+@pytest.mark.parametrize('algorithms,shard,unitigs,packed', [
+    (['unknown'], (0, 1), False, False),
+    (['greedy'], (1, 1), False, False),
+    (['gha'], (0, 1), True, False),  # together with compact
+    (['gha'], (0, 1), False, True),
+])
+def test_invalid_arguments(algorithms, shard, unitigs, packed):
+    with pytest.raises(ValueError):
+        list(solve_many(instances, algorithms, shard=shard, compact=unitigs or packed, unitigs=unitigs,
+                        packed=packed))
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_graph_digest(compact):
+    results = {result.algorithm: result for result in solve_many(instances[1:2], compact=compact, summarize=True)}
+    assert results['greedy'].graph_digest is None and results['t_greedy'].graph_digest is None
+    assert results['gha'].graph_digest == results['trivial_ca'].graph_digest
+
+
+def test_graph_digest_ignores_representation():
+    strings = instances[3]
+    graphs = [HierarchicalSolver(strings, compact) for compact in (False, True)] + [
+        HierarchicalSolver(strings, unitigs=True), HierarchicalSolver(strings, packed=True)
+    ]
+    for solver in graphs:
+        solver.gha()
+    assert len({graph_digest(solver.hg) for solver in graphs}) == 1
+
+
+def test_unitigs_for_gha_only():
+    solver = HierarchicalSolver(instances[3], unitigs=True)
+    assert solver.trivial_ca() == HierarchicalSolver(instances[3]).trivial_ca()
+    assert type(solver.hg) is HierarchicalGraph
+    solver.gha()
+    assert type(solver.hg) is UnitigHierarchicalGraph
+
+
+def test_time_budget():
+    for result in solve_many(instances, time_budget=0):
+        strings = instances[result.instance]
+        for string in strings:
+            assert string in result.superstring
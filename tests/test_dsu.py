@@ -0,0 +1,37 @@
+import random
+
+import pytest
+
+from src.dsu import DSU, ArrayDSU
+
+strings = ['', 'a', 'b', 'ab', 'ba', 'bb', 'abb', 'bab']
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_array_dsu_matches_dsu(seed):
+    rng = random.Random(seed)
+    order = sorted(range(len(strings)), key=lambda x: (-len(strings[x]), strings[x]))
+    position = [0] * len(strings)
+    for i, x in enumerate(order):
+        position[x] = i
+
+    dsu, array_dsu = DSU(strings), ArrayDSU(len(strings), position)
+    for _ in range(6):
+        a, b = rng.randrange(len(strings)), rng.randrange(len(strings))
+        dsu.union(strings[a], strings[b])
+        array_dsu.union(a, b)
+
+        for x in range(len(strings)):
+            assert dsu.last[dsu.find_parent(strings[x])] == strings[array_dsu.last[array_dsu.find_parent(x)]]
+            for y in range(len(strings)):
+                same = dsu.find_parent(strings[x]) == dsu.find_parent(strings[y])
+                assert same == (array_dsu.find_parent(x) == array_dsu.find_parent(y))
+
+
+def test_array_dsu_long_chain():
+    size = 100000
+    dsu = ArrayDSU(size)
+    for i in range(size - 1):
+        dsu._parent[i] = i + 1  # the deepest possible chain
+    assert dsu.find_parent(0) == size - 1
+    assert dsu.last[dsu.find_parent(size // 2)] == size - 1
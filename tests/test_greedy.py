@@ -1,3 +1,5 @@
+import random
+
 import pytest
 
 from src import GreedySolver
@@ -151,6 +153,15 @@ t_greedy_data = [
         ],
         27,
     ),
+    (  # overlap of cycle strings is longer than the one of their boundary strings
+        [
+            'CA',
+            'AC',
+            'A',
+            'C',
+        ],
+        3,
+    ),
 ]
 
 
@@ -161,3 +172,77 @@ def test_t_greedy(strings, expected):
     assert len(res) == expected
     for string in strings:
         assert string in res
+
+
+@pytest.mark.parametrize('strings', [strings for strings, _ in greedy_data + t_greedy_data if len(strings) > 1])
+def test_sparse_matches_dense(strings):
+    dense = GreedySolver(strings)
+    sparse = GreedySolver(strings, sparse=True)
+    assert sparse.greedy() == dense.greedy()
+    assert sparse.t_greedy() == dense.t_greedy()
+
+
+@pytest.mark.parametrize('strings', [strings for strings, _ in greedy_data + t_greedy_data if len(strings) > 1])
+@pytest.mark.parametrize('top_k', [1, 2])
+def test_top_k_is_valid(strings, top_k):
+    gs = GreedySolver(strings, top_k=top_k)
+    for res in (gs.greedy(), gs.t_greedy()):
+        for string in strings:
+            assert string in res
+
+
+@pytest.mark.parametrize('strings', [strings for strings, _ in greedy_data + t_greedy_data if len(strings) > 1])
+def test_parallel_overlaps_match(strings):
+    serial = GreedySolver(strings)
+    parallel = GreedySolver(strings, workers=2)
+    assert parallel.greedy() == serial.greedy()
+    assert parallel.t_greedy() == serial.t_greedy()
+
+
+@pytest.mark.parametrize('strings', [strings for strings, _ in greedy_data + t_greedy_data])
+@pytest.mark.parametrize('algorithm', ['greedy', 't_greedy'])
+def test_progress(strings, algorithm):
+    reports = []
+    for report in getattr(GreedySolver(strings), 'iter_' + algorithm)():
+        superstring = report.superstring()
+        assert len(superstring) == report.length
+        for string in strings:
+            assert string in superstring
+        reports.append(report)
+    assert [report.done for report in reports] == [False] * (len(reports) - 1) + [True]
+    assert [report.edges for report in reports] == sorted(report.edges for report in reports)
+    assert reports[-1].contigs == 1
+    assert reports[-1].superstring() == getattr(GreedySolver(strings), algorithm)()
+
+
+@pytest.mark.parametrize('strings', [
+    ['abc', 'bcd', 'cde', 'xyz', 'yzq'],
+    *(strings for strings, _ in greedy_data + t_greedy_data),
+])
+@pytest.mark.parametrize('algorithm', ['greedy', 't_greedy'])
+def test_kept_progress(strings, algorithm):
+    reports = list(getattr(GreedySolver(strings), 'iter_' + algorithm)())
+    for report in reports:
+        superstring = report.superstring()
+        assert len(superstring) == report.length
+        for string in strings:
+            assert string in superstring
+
+
+@pytest.mark.parametrize('strings', [strings for strings, _ in greedy_data + t_greedy_data])
+@pytest.mark.parametrize('algorithm', ['greedy', 't_greedy'])
+def test_time_budget(strings, algorithm):
+    *_, last = getattr(GreedySolver(strings), 'iter_' + algorithm)(time_budget=0)
+    assert last.done == (len(strings) == 1) and last.edges == 0
+    superstring = getattr(GreedySolver(strings), algorithm)(time_budget=0)
+    assert superstring == ''.join(strings)
+
+
+@pytest.mark.parametrize('algorithm', ['greedy', 't_greedy'])
+def test_default_every(algorithm):
+    generator = random.Random(0)
+    strings = sorted({''.join(generator.choices('ACGT', k=8)) for _ in range(300)})
+    # a report copies the chain links, so only about a hundred of them are made by default
+    reports = list(getattr(GreedySolver(strings), 'iter_' + algorithm)())
+    assert len(reports) <= 2 * 100 + 2
+    assert reports[-1].superstring() == getattr(GreedySolver(strings), algorithm)()
@@ -1,7 +1,14 @@
+from collections import Counter
+
 import pytest
 from networkx import symmetric_difference
 
-from src import HierarchicalGraph
+from src import (CompactHierarchicalGraph, HierarchicalGraph, HierarchicalSolver, PackedHierarchicalGraph,
+                 UnitigHierarchicalGraph)
+
+graph_classes = [
+    HierarchicalGraph, CompactHierarchicalGraph, UnitigHierarchicalGraph, PackedHierarchicalGraph,
+]
 
 trivial_data = [
     (
@@ -32,8 +39,9 @@ trivial_data = [
 
 
 @pytest.mark.parametrize('strings,expected', trivial_data)
-def test_trivial_solution(strings, expected):
-    hg = HierarchicalGraph(strings)
+@pytest.mark.parametrize('graph_class', graph_classes)
+def test_trivial_solution(strings, expected, graph_class):
+    hg = graph_class(strings)
     hg.construct_trivial_graph()
     result = hg.to_string()
     assert len(result) == expected
@@ -81,8 +89,9 @@ greedy_data = [
 
 
 @pytest.mark.parametrize('strings,expected', greedy_data)
-def test_greedy_solution(strings, expected):
-    hg = HierarchicalGraph(strings)
+@pytest.mark.parametrize('graph_class', graph_classes)
+def test_greedy_solution(strings, expected, graph_class):
+    hg = graph_class(strings)
     hg.construct_greedy_graph()
     result = hg.to_string()
     assert len(result) == expected
@@ -151,3 +160,95 @@ def test_collapsed_greedy_solution(strings):
     # CA(GHA) == GHA
     hg.double_and_collapse()
     assert len(symmetric_difference(hg.graph, graph).edges()) == 0
+
+
+@pytest.mark.parametrize('strings', collapsing_data + [strings for strings, _ in greedy_data])
+@pytest.mark.parametrize('graph_class', graph_classes[1:])
+def test_graph_variants_match(strings, graph_class):
+    hg, other = HierarchicalGraph(strings), graph_class(strings)
+    hg.construct_greedy_graph()
+    other.construct_greedy_graph()
+    assert Counter(other.graph.edges()) == Counter(hg.graph.edges())
+
+    hg, other = HierarchicalGraph(strings), graph_class(strings)
+    hg.construct_trivial_graph()
+    hg.double_and_collapse()
+    other.construct_trivial_graph()
+    other.double_and_collapse()
+    assert Counter(other.graph.edges()) == Counter(hg.graph.edges())
+
+
+@pytest.mark.parametrize('edges', [
+    [('ab', 'aba')],  # unbalanced
+    [('a', 'ab'), ('ab', 'b'), ('b', 'ba'), ('ba', 'a')],  # not connected to the empty string
+])
+def test_to_string_without_solution(edges):
+    hg = HierarchicalGraph(['aba'])
+    for u, v in edges:
+        if len(u) < len(v):
+            hg._add_up(v)
+        else:
+            hg._add_down(u)
+    with pytest.raises(ValueError):
+        hg.to_string()
+
+
+@pytest.mark.parametrize('strings', collapsing_data)
+def test_to_string_matches_across_variants(strings):
+    results = set()
+    for graph_class in graph_classes:
+        hg = graph_class(strings)
+        hg.construct_greedy_graph()
+        results.add(hg.to_string())
+    assert len(results) == 1
+
+
+@pytest.mark.parametrize('strings', [
+    ['ACGTACGGTCAGTTGCA', 'GTTGCAAGTCCGATTAC', 'CGATTACCTGAGT'],
+    ['abcdefghij', 'ghijklmnop', 'klmnopabcd'],
+])
+def test_unitigs_compress_chains(strings):
+    hg, unitigs = HierarchicalGraph(strings), UnitigHierarchicalGraph(strings)
+    hg.construct_greedy_graph()
+    unitigs.construct_greedy_graph()
+    assert Counter(unitigs.graph.edges()) == Counter(hg.graph.edges())
+    assert unitigs.to_string() == hg.to_string()
+    # only the strings and their overlaps are stored
+    assert sum(map(len, unitigs._levels.values())) < sum(map(len, hg._levels.values())) // 4
+
+
+@pytest.mark.parametrize('strings', collapsing_data + [strings for strings, _ in greedy_data])
+@pytest.mark.parametrize('algorithm', ['gha', 'trivial_ca'])
+@pytest.mark.parametrize('compact', [False, True])
+def test_progress(strings, algorithm, compact):
+    reports = list(getattr(HierarchicalSolver(strings, compact), 'iter_' + algorithm)())
+    for report in reports:
+        superstring = report.superstring()
+        assert len(superstring) == report.length
+        for string in strings:
+            assert string in superstring
+    assert [report.done for report in reports] == [False] * (len(reports) - 1) + [True]
+    assert reports[-1].superstring() == getattr(HierarchicalSolver(strings, compact), algorithm)()
+
+
+@pytest.mark.parametrize('strings', collapsing_data)
+@pytest.mark.parametrize('algorithm', ['gha', 'trivial_ca'])
+def test_time_budget(strings, algorithm):
+    *_, last = getattr(HierarchicalSolver(strings), 'iter_' + algorithm)(time_budget=0)
+    assert not last.done and last.edges == 0
+    assert getattr(HierarchicalSolver(strings), algorithm)(time_budget=0) == ''.join(strings)
+
+
+@pytest.mark.parametrize('strings', collapsing_data)
+def test_collapse_out_of_time(strings, monkeypatch):
+    hg = HierarchicalGraph(strings)
+    hg.construct_trivial_graph()
+
+    def double_and_collapse(self, deadline=None):
+        raise TimeoutError
+
+    monkeypatch.setattr(HierarchicalGraph, 'double_and_collapse', double_and_collapse)
+    # the strings merged in their order, the eulerian path of the trivial graph might spell another solution
+    superstring = HierarchicalSolver(strings).trivial_ca(time_budget=60)
+    assert len(superstring) == len(hg.to_string())
+    assert sorted(strings, key=superstring.index) == strings
@@ -1,6 +1,15 @@
+import random
+from importlib.util import find_spec
+
 import pytest
 
-from src.overlap import calculate_overlap
+from src.overlap import OVERLAP_BACKENDS, all_overlaps, calculate_overlap
+
+backends = [
+    pytest.param(backend, marks=pytest.mark.skipif(find_spec('numpy') is None, reason='numpy is not installed'))
+    if backend == 'numpy' else backend
+    for backend in OVERLAP_BACKENDS
+]
 
 overlap_data = [
     ('', '', 0),
@@ -16,3 +25,58 @@ overlap_data = [
 @pytest.mark.parametrize('s1,s2,expected', overlap_data)
 def test_overlap(s1, s2, expected):
     assert calculate_overlap(s1, s2) == expected
+
+
+all_overlaps_data = [
+    [],
+    ['abc'],
+    ['abc', 'bcd', 'cde'],
+    ['aaaabaa', 'aaaaaaa', 'aa', 'a'],
+    ['abab', 'baba', 'abab', 'ab', ''],
+    ['ccaeae', 'eaeaea', 'aeaecc'],
+    ['CGGGG', 'GGGGT', 'GCAAC', 'CTGCT', 'CTCCG', 'TTTAG', 'GGGGG', 'AGACG', 'CGGGC'],
+]
+
+
+@pytest.mark.parametrize('strings', all_overlaps_data)
+@pytest.mark.parametrize('backend', backends)
+def test_all_overlaps(strings, backend):
+    expected = {
+        (i, j): calculate_overlap(strings[i], strings[j])
+        for i in range(len(strings)) for j in range(len(strings)) if i != j
+    }
+    result = {edge: 0 for edge in expected}
+    for i, j, overlap in all_overlaps(strings, backend):
+        assert overlap > 0 and (i, j) in expected
+        result[(i, j)] = overlap
+    assert result == expected
+
+
+def test_all_overlaps_random_cross_check():
+    rng = random.Random(0)
+    strings = [''.join(rng.choices('AC', k=rng.randint(1, 8))) for _ in range(40)]
+    assert sorted(all_overlaps(strings, 'aho_corasick')) == sorted(all_overlaps(strings, 'kmp'))
+
+
+def test_overlap_matrix():
+    np = pytest.importorskip('numpy')
+    from src.overlap_numpy import overlap_matrix
+
+    strings = ['ACGTA', 'GTACC', 'TACCA', 'CCAAC']
+    expected = [[calculate_overlap(a, b) if a is not b else 0 for b in strings] for a in strings]
+    matrix = overlap_matrix(strings)
+    assert isinstance(matrix, np.ndarray)
+    assert matrix.tolist() == expected
+    assert overlap_matrix(strings, [2, 0]).tolist() == [expected[2], expected[0]]
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        all_overlaps(['a'], 'unknown')
+
+
+@pytest.mark.parametrize('strings', all_overlaps_data)
+@pytest.mark.parametrize('backend', backends)
+@pytest.mark.parametrize('workers', [2, 3])
+def test_parallel_overlaps(strings, backend, workers):
+    assert sorted(all_overlaps(strings, backend, workers)) == sorted(all_overlaps(strings, backend))
@@ -0,0 +1,94 @@
+import os
+import random
+
+import pytest
+
+from src import GreedySolver, OverlapCache, OverlapIndex
+
+cache_data = [
+    ['abc'],
+    ['abc', 'bcd', 'cde'],
+    ['cde', 'bcd', 'abc'],
+    ['aaaabaa', 'aaaaaaa', 'aa', 'a'],
+    ['CGGGG', 'GGGGT', 'GCAAC', 'CTGCT', 'CTCCG', 'TTTAG', 'GGGGG', 'AGACG', 'CGGGC'],
+]
+
+
+@pytest.mark.parametrize('strings', cache_data)
+def test_hit_on_permutation(strings, tmp_path):
+    cache = OverlapCache(str(tmp_path))
+    expected = list(OverlapIndex(strings, cache=cache).triples())
+    assert cache.load(strings) is not None
+
+    shuffled = strings[:]
+    random.Random(0).shuffle(shuffled)
+    position = {string: i for i, string in enumerate(shuffled)}
+    cached = OverlapIndex(shuffled, cache=cache)
+    # the renumbered overlaps are stored for the new order
+    assert len(os.listdir(tmp_path)) == (1 if shuffled == strings else 2)
+    mapped = OverlapIndex(shuffled, cache=cache)
+    assert isinstance(mapped.indices, memoryview)
+    for index in (cached, mapped):
+        assert sorted(index.triples()) == sorted(
+            (position[strings[i]], position[strings[j]], overlap) for i, j, overlap in expected
+        )
+
+
+def test_read_only_cache(tmp_path, monkeypatch):
+    strings = cache_data[-1]
+    cache = OverlapCache(str(tmp_path))
+    expected = list(OverlapIndex(strings, cache=cache).triples())
+
+    def read_only(*args, **kwargs):
+        raise PermissionError('read-only cache')
+    monkeypatch.setattr(os, 'utime', read_only)
+    monkeypatch.setattr(OverlapCache, 'store', read_only)
+    assert list(cache.load(strings).triples()) == expected
+    shuffled = strings[::-1]
+    assert sorted(cache.load(shuffled).triples()) == sorted(
+        (len(strings) - 1 - i, len(strings) - 1 - j, overlap) for i, j, overlap in expected
+    )
+
+
+def test_same_order_hit_is_mapped(tmp_path):
+    strings = cache_data[-1]
+    assert strings != sorted(strings)
+    cache = OverlapCache(str(tmp_path))
+    OverlapIndex(strings, cache=cache)
+    index = OverlapIndex(strings, cache=cache)
+    assert isinstance(index.indices, memoryview)
+    assert GreedySolver(strings, cache=cache).greedy() == GreedySolver(strings).greedy()
+    assert GreedySolver(strings, cache=cache).t_greedy() == GreedySolver(strings).t_greedy()
+
+
+def test_corrupted_file_is_a_miss(tmp_path):
+    strings = cache_data[1]
+    cache = OverlapCache(str(tmp_path))
+    with open(cache.path(strings), 'wb') as file:
+        file.write(b'garbage')
+    assert cache.load(strings) is None
+    assert list(OverlapIndex(strings, cache=cache).triples()) == [(0, 1, 2), (0, 2, 1), (1, 2, 2)]
+
+
+@pytest.mark.parametrize('max_bytes,max_entries,expected', [
+    (None, None, 3),
+    (None, 2, 2),
+    (0, None, 0),
+])
+def test_eviction(max_bytes, max_entries, expected, tmp_path):
+    cache = OverlapCache(str(tmp_path), max_bytes, max_entries)
+    for strings in cache_data[2:]:
+        OverlapIndex(strings, cache=cache)
+    assert len(os.listdir(tmp_path)) == expected
+
+
+def test_least_recently_used_is_evicted(tmp_path):
+    cache = OverlapCache(str(tmp_path), max_entries=2)
+    first, second, third = cache_data[1], cache_data[3], cache_data[4]
+    OverlapIndex(first, cache=cache)
+    OverlapIndex(second, cache=cache)
+    os.utime(cache.path(first), (0, 0))
+    os.utime(cache.path(second), (1, 1))
+    assert cache.load(first) is not None  # touches the file
+    OverlapIndex(third, cache=cache)
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(cache.path(s)) for s in (first, third))
@@ -0,0 +1,59 @@
+import pickle
+from multiprocessing import Pool
+
+import pytest
+
+from src import GreedySolver, HierarchicalSolver, OverlapIndex
+from src.overlap import all_overlaps
+
+index_data = [
+    ['abc'],
+    ['abc', 'bcd', 'cde'],
+    ['cde', 'bcd', 'abc'],
+    ['aaaabaa', 'aaaaaaa', 'aa', 'a'],
+    ['CGGGG', 'GGGGT', 'GCAAC', 'CTGCT', 'CTCCG', 'TTTAG', 'GGGGG', 'AGACG', 'CGGGC'],
+]
+
+
+def _greedy(solver: GreedySolver) -> str:
+    return solver.greedy()
+
+
+@pytest.mark.parametrize('strings', index_data)
+def test_index_matches_all_overlaps(strings):
+    index = OverlapIndex(strings)
+    assert list(index.triples()) == sorted(all_overlaps(strings))
+
+
+@pytest.mark.parametrize('strings', index_data)
+def test_shared_copy(strings):
+    index = OverlapIndex(strings).share()
+    try:
+        copy = pickle.loads(pickle.dumps(index))
+        assert list(copy.triples()) == list(index.triples())
+        assert copy.strings == strings
+        copy.close()
+    finally:
+        index.unlink()
+
+
+@pytest.mark.parametrize('strings', index_data)
+def test_solvers_with_index(strings):
+    index = OverlapIndex(strings)
+    for sparse in (False, True):
+        assert GreedySolver(strings, sparse=sparse, overlaps=index).greedy() == GreedySolver(strings).greedy()
+        assert GreedySolver(strings, sparse=sparse, overlaps=index).t_greedy() == GreedySolver(strings).t_greedy()
+    for compact in (False, True):
+        assert (HierarchicalSolver(strings, compact, overlaps=index).trivial_ca()
+                == HierarchicalSolver(strings, compact).trivial_ca())
+
+
+def test_index_in_pool():
+    strings = index_data[-1]
+    index = OverlapIndex(strings).share()
+    try:
+        with Pool(processes=2) as pool:
+            solutions = pool.map(_greedy, [GreedySolver(strings, overlaps=index)] * 2)
+    finally:
+        index.unlink()
+    assert solutions == [GreedySolver(strings).greedy()] * 2
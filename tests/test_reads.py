@@ -0,0 +1,56 @@
+import gzip
+import io
+import sys
+
+import pytest
+
+from utils import read_strings
+
+reads_data = [
+    ('>r1\nACGT\nAC\n\n>r2\nGTA\n>r3\nACGTAC\n', None, ['ACGTAC', 'GTA']),
+    ('@r1\nACGT\n+\nIIII\n@r2\nGGA\n+r2\n@II\n@r3\nACGT\n+\nIIII\n', None, ['ACGT', 'GGA']),
+    ('ACGT\n\nGGA\r\nACGT\n', None, ['ACGT', 'GGA']),
+    ('>x\nAC\n', 'plain', ['>x', 'AC']),
+    ('', None, []),
+]
+
+
+@pytest.mark.parametrize('content,read_format,expected', reads_data)
+@pytest.mark.parametrize('compressed', [False, True])
+def test_read_strings(content, read_format, expected, compressed, tmp_path):
+    path = tmp_path / 'reads'
+    if compressed:
+        with gzip.open(path, 'wt') as file:
+            file.write(content)
+    else:
+        path.write_text(content)
+    assert list(read_strings(str(path), read_format)) == expected
+
+
+@pytest.mark.parametrize('compressed', [False, True])
+def test_stdin(compressed, monkeypatch):
+    content = reads_data[1][0].encode()
+    stdin = io.TextIOWrapper(io.BufferedReader(io.BytesIO(gzip.compress(content) if compressed else content)))
+    monkeypatch.setattr(sys, 'stdin', stdin)
+    assert list(read_strings('-')) == reads_data[1][2]
+    assert not stdin.closed
+
+
+def test_duplicates_kept(tmp_path):
+    path = tmp_path / 'reads.txt'
+    path.write_text('AC\nAC\nGT\n')
+    assert list(read_strings(str(path), unique=False)) == ['AC', 'AC', 'GT']
+
+
+@pytest.mark.parametrize('content,read_format', [
+    ('@r1\nAC\n+\nII\nAC\n', None),
+    ('@r1\nAC\n+\nII\n@r2\n', None),
+    ('@r1\nAC\n+\nII\n@r2\nGT\n+\n', None),
+    ('@r1\nAC\nII\nII\n', None),
+    ('AC\n', 'fastb'),
+])
+def test_malformed_input(content, read_format, tmp_path):
+    path = tmp_path / 'reads'
+    path.write_text(content)
+    with pytest.raises(ValueError):
+        list(read_strings(str(path), read_format))
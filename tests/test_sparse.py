@@ -0,0 +1,48 @@
+import sys
+
+import pytest
+
+from src.sparse import SparseOverlaps
+
+triples = [
+    (0, 2, 1),
+    (2, 0, 3),
+    (0, 1, 2),
+    (1, 2, 2),
+    (0, 3, 2),
+]
+
+
+def test_lookup():
+    overlaps = SparseOverlaps(4, triples)
+    assert len(overlaps) == len(triples)
+    for i, j, overlap in triples:
+        assert overlaps[(i, j)] == overlap
+    assert overlaps[(1, 0)] == 0
+    assert overlaps[(3, 2)] == 0
+
+
+def test_edges_order():
+    overlaps = SparseOverlaps(4, triples)
+    assert list(overlaps.edges()) == [(2, 0), (0, 1), (0, 3), (1, 2), (0, 2)]
+
+
+@pytest.mark.parametrize('top_k,expected', [
+    (0, []),
+    (1, [(2, 0), (0, 1), (1, 2)]),
+    (2, [(2, 0), (0, 1), (0, 3), (1, 2)]),
+])
+def test_top_k(top_k, expected):
+    overlaps = SparseOverlaps(4, triples, top_k)
+    assert list(overlaps.edges()) == expected
+
+
+@pytest.mark.parametrize('numpy', [True, False])
+def test_renumbered(numpy, monkeypatch):
+    if not numpy:
+        monkeypatch.setitem(sys.modules, 'numpy', None)  # import fails, the array fallback is used
+    position = [2, 0, 3, 1]
+    renumbered = SparseOverlaps(4, triples).renumbered(position)
+    expected = SparseOverlaps(4, [(position[i], position[j], overlap) for i, j, overlap in triples])
+    assert list(renumbered.triples()) == list(expected.triples())
+    assert list(renumbered.indptr) == list(expected.indptr)
@@ -0,0 +1,84 @@
+import tracemalloc
+
+import pytest
+
+from src import GreedySolver, HierarchicalSolver, Stats, solve_many
+from src.dsu import DSU, ArrayDSU
+
+instances = [
+    ['abc', 'bcd', 'cde'],
+    ['CGGGG', 'GGGGT', 'GCAAC', 'CTGCT', 'CTCCG', 'TTTAG', 'GGGGG', 'AGACG', 'CGGGC'],
+    ['aaab', 'abbb', 'bbba', 'baaa'],
+]
+
+
+def test_phases():
+    stats = Stats(memory=True)
+    with stats.phase('outer'):
+        with stats.phase('inner'):
+            data = [0] * 100000
+        del data
+    with stats.phase('inner'):
+        pass
+    stats.count('things', 3)
+    stats.count('things')
+    stats.stop()
+    assert not tracemalloc.is_tracing()
+    assert stats.phases['inner'].calls == 2
+    assert stats.phases['outer'].calls == 1
+    assert stats.phases['inner'].peak_memory >= 800000
+    assert stats.phases['outer'].peak_memory >= stats.phases['inner'].peak_memory
+    assert stats.phases['outer'].time >= stats.phases['inner'].time > 0
+    assert stats.counters == {'things': 4}
+    assert set(stats.as_dict()['phases']) == {'outer', 'inner'}
+
+
+def test_disabled():
+    stats = Stats(enabled=False, memory=True)
+    with stats.phase('phase'):
+        stats.count('things')
+    assert not stats.phases and not stats.counters
+
+
+@pytest.mark.parametrize('strings', instances)
+def test_greedy_counters(strings):
+    stats = Stats()
+    superstring = GreedySolver(strings, stats=stats).greedy()
+    assert superstring == GreedySolver(strings).greedy()
+    assert set(stats.phases) == {'overlaps', 'sort_edges', 'greedy'}
+    assert stats.counters['edges_accepted'] == len(strings) - 1
+    assert stats.counters['edges_examined'] >= stats.counters['edges_accepted']
+    # a cycle check and a union per accepted edge
+    assert stats.counters['dsu_finds'] >= 4 * stats.counters['edges_accepted']
+
+
+@pytest.mark.parametrize('strings', instances)
+@pytest.mark.parametrize('compact', [False, True])
+def test_hierarchical_counters(strings, compact):
+    stats = Stats()
+    superstring = HierarchicalSolver(strings, compact, stats=stats).trivial_ca()
+    assert superstring == HierarchicalSolver(strings, compact).trivial_ca()
+    assert set(stats.phases) >= {'trivial_graph', 'collapse', 'euler_path'}
+    assert stats.counters['collapse_iterations'] > 0
+    assert stats.counters['dsu_finds'] > 0
+
+
+@pytest.mark.parametrize('stats', [None, Stats(enabled=False), Stats()])
+def test_dsu_finds(stats):
+    dsu, array_dsu = DSU([], stats=stats), ArrayDSU(4, stats=stats)
+    for a, b in [(0, 1), (2, 3), (1, 3)]:
+        dsu.union(str(a), str(b))
+        array_dsu.union(a, b)
+    dsu.find_parent('0')
+    array_dsu.find_parent(0)
+    if stats is not None and stats.enabled:
+        assert stats.counters['dsu_finds'] == 2 * 7
+    else:
+        assert 'find_parent' not in vars(dsu) and 'find_parent' not in vars(array_dsu)
+
+
+def test_solve_many_profile():
+    results = list(solve_many(instances, ['t_greedy', 'gha'], profile=True))
+    assert all(result.stats['phases'] for result in results)
+    assert all(result.stats is None for result in solve_many(instances, ['t_greedy', 'gha']))
+    assert not tracemalloc.is_tracing()
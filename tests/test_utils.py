@@ -1,8 +1,11 @@
+import random
 from collections import Counter
 
 import pytest
 
-from utils import counting_sort, ensure_substring_free
+from utils import (
+    AhoCorasick, Packer, bucket_sort_edges, counting_sort, ensure_substring_free, missing_strings, verify_solutions
+)
 
 ensure_substring_free_data = [
     (
@@ -52,6 +55,28 @@ def test_ensure_substring_free(strings, expected):
     assert len(free) == len(expected) and not list(Counter(free) - Counter(expected))
 
 
+@pytest.mark.parametrize('strings,expected', [
+    (['cde', 'x', 'abcde', 'x'], ['x', 'abcde']),
+    (['b', 'a', 'b', '', 'ab'], ['ab']),
+    (['', 'a', ''], ['a']),
+    (['', ''], ['']),
+    ([], []),
+    (['ba', 'ab', 'ba', 'aba', 'bab'], ['aba', 'bab']),
+])
+def test_ensure_substring_free_order(strings, expected):
+    assert ensure_substring_free(strings) == expected
+    assert ensure_substring_free(iter(strings)) == expected
+
+
+def test_ensure_substring_free_random_cross_check():
+    rng = random.Random(0)
+    for _ in range(300):
+        strings = [''.join(rng.choices('ab', k=rng.randint(0, 5))) for _ in range(rng.randint(0, 10))]
+        unique = list(dict.fromkeys(strings))
+        expected = [string for string in unique if not any(string != other and string in other for other in unique)]
+        assert ensure_substring_free(strings) == expected
+
+
 counting_sort_data = [
     (
         [
@@ -93,3 +118,78 @@ counting_sort_data = [
 @pytest.mark.parametrize('element,reference,expected', counting_sort_data)
 def test_counting_sort(element, reference, expected):
     assert counting_sort(element, reference) == expected
+
+
+matches_data = [
+    (['a'], 'aaa', [(1, 0), (2, 0), (3, 0)]),
+    (['he', 'she', 'his', 'hers'], 'ushers', [(4, 1), (4, 0), (6, 3)]),
+    (['ab', 'b', 'ab'], 'xabx', [(3, 0), (3, 2), (3, 1)]),
+    (['abc'], 'ab', []),
+]
+
+
+@pytest.mark.parametrize('strings,text,expected', matches_data)
+def test_aho_corasick_matches(strings, text, expected):
+    assert list(AhoCorasick(strings).iter_matches(text)) == expected
+
+
+bucket_sort_edges_data = [
+    (3, [], []),
+    (3, [((0, 1), 0), ((1, 2), 0)], []),
+    (
+        3,
+        [((0, 1), 1), ((0, 2), 2), ((1, 0), 0), ((1, 2), 2), ((2, 0), 1), ((2, 1), 3)],
+        [(2, 1), (0, 2), (1, 2), (0, 1), (2, 0)],
+    ),
+]
+
+
+@pytest.mark.parametrize('n,weighted_edges,expected', bucket_sort_edges_data)
+def test_bucket_sort_edges(n, weighted_edges, expected):
+    assert list(bucket_sort_edges(n, weighted_edges)) == expected
+
+
+@pytest.mark.parametrize('alphabet,bits', [('ACGT', 2), ('01', 1), ('abc', 2), ('a', 1), ('abcdefghi', 4)])
+def test_packer(alphabet, bits):
+    rng = random.Random(0)
+    packer = Packer(alphabet * 2)
+    assert packer.bits == bits
+    strings = sorted({''.join(rng.choices(alphabet, k=rng.randint(1, 40))) for _ in range(100)})
+    for string in strings:
+        code = packer.pack(string)
+        assert packer.unpack(code) == string
+        assert packer.length(code) == len(string)
+        assert code >> bits == packer.pack(string[:-1])
+        assert packer.suffix(code) == packer.pack(string[1:])
+    assert packer.pack('') == 1
+    # codes of equally long strings are ordered like the strings
+    assert sorted(strings, key=lambda x: (len(x), packer.pack(x))) == sorted(strings, key=lambda x: (len(x), x))
+
+
+def test_packer_wide_alphabet():
+    packer = Packer(map(chr, range(100)))
+    string = ''.join(map(chr, range(99, -1, -1)))
+    assert packer.bits == 7
+    assert packer.unpack(packer.pack(string)) == string
+
+
+verify_data = [
+    (['abc', 'bcd', 'cde'], ['abcde', 'abcd', 'xcdex', ''], [[], ['cde'], ['abc', 'bcd'], ['abc', 'bcd', 'cde']]),
+    (['a', 'a', ''], ['ba', 'b'], [[], ['a', 'a']]),
+    (['she', 'he', 'hers', 'his'], ['ushers', 'hishe'], [['his'], ['hers']]),
+]
+
+
+@pytest.mark.parametrize('strings,solutions,expected', verify_data)
+@pytest.mark.parametrize('workers', [1, 2])
+def test_verify_solutions(strings, solutions, expected, workers):
+    assert verify_solutions(strings, solutions, workers) == expected
+
+
+def test_missing_strings_random_cross_check():
+    rng = random.Random(0)
+    for _ in range(200):
+        strings = [''.join(rng.choices('ab', k=rng.randint(1, 4))) for _ in range(rng.randint(1, 8))]
+        superstring = ''.join(rng.choices('ab', k=rng.randint(0, 12)))
+        expected = [i for i, string in enumerate(strings) if string not in superstring]
+        assert missing_strings(AhoCorasick(strings), superstring) == expected
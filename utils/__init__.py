@@ -1 +1,5 @@
-from .utils import counting_sort, ensure_substring_free
+from .aho_corasick import AhoCorasick
+from .packing import Packer
+from .reads import READ_FORMATS, read_strings
+from .utils import bucket_edges, bucket_sort_edges, counting_sort, drain_buckets, ensure_substring_free
+from .verify import missing_strings, verify_solutions
@@ -0,0 +1,68 @@
+from collections import deque
+from typing import Dict, Iterator, List, Tuple
+
+
+class AhoCorasick:
+    """
+    Aho–Corasick automaton over the given strings.
+    Every node is a distinct prefix of some string, node 0 is the root (empty prefix)
+    """
+    def __init__(self, strings: List[str]):
+        self.children: List[Dict[str, int]] = [{}]
+        self.depth: List[int] = [0]
+        self.fail: List[int] = [0]
+        self.output: List[int] = [0]  # the nearest node on the fail chain where some string ends
+        self.ends: Dict[int, List[int]] = {}  # node -> indices of strings ending there
+
+        children, depth, fail, output = self.children, self.depth, self.fail, self.output
+        for i, string in enumerate(strings):
+            node = 0
+            for char in string:
+                nxt = children[node].get(char)
+                if nxt is None:
+                    nxt = len(children)
+                    children[node][char] = nxt
+                    children.append({})
+                    depth.append(depth[node] + 1)
+                node = nxt
+            self.ends.setdefault(node, []).append(i)
+
+        fail.extend(bytes(len(children) - 1))
+        output.extend(bytes(len(children) - 1))
+        ends = self.ends
+        queue = deque(children[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in children[node].items():
+                link = fail[node]
+                while link and char not in children[link]:
+                    link = fail[link]
+                link = children[link].get(char, 0)
+                fail[child] = link
+                output[child] = link if link in ends else output[link]
+                queue.append(child)
+
+    def walk(self, text: str, node: int = 0) -> int:
+        """
+        Feeds text to the automaton
+        :return: node of the longest suffix of text which is a prefix of some string
+        """
+        children, fail = self.children, self.fail
+        for char in text:
+            while node and char not in children[node]:
+                node = fail[node]
+            node = children[node].get(char, 0)
+        return node
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """
+        Yields (end, i) for every occurrence of strings[i] in text ending at position end (exclusive)
+        """
+        node = 0
+        for pos, char in enumerate(text, 1):
+            node = self.walk(char, node)
+            match = node if node in self.ends else self.output[node]
+            while match:
+                for i in self.ends[match]:
+                    yield pos, i
+                match = self.output[match]
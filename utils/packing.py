@@ -0,0 +1,48 @@
+from typing import Iterable
+
+_DIGITS = '0123456789abcdefghijklmnopqrstuv'  # digits of int() up to base 32
+
+
+class Packer:
+    """
+    Packs strings over a small alphabet into ints with a fixed number of bits per char, 2 for DNA.
+    The code of a string is 1 followed by the codes of its chars, so strings of different lengths
+    never collide and the empty string is 1. The chars are numbered in sorted order, hence
+    codes of equally long strings compare like the strings, e.g. code >> bits drops the last char
+    """
+    def __init__(self, alphabet: Iterable[str]):
+        """
+        :param alphabet: all the chars which can occur in the strings, possibly repeated
+        """
+        self.alphabet: str = ''.join(sorted(set(alphabet)))
+        self.bits: int = max(1, (len(self.alphabet) - 1).bit_length())
+        self._base: int = 1 << self.bits
+        # chars are translated to int() digits of the base, so packing runs in C
+        self._digits = str.maketrans(self.alphabet, _DIGITS[:len(self.alphabet)]) if self._base <= 32 else None
+        self._codes = {char: code for code, char in enumerate(self.alphabet)}
+
+    def pack(self, string: str) -> int:
+        if self._digits is not None:
+            return int('1' + string.translate(self._digits), self._base)
+        code = 1
+        for char in string:
+            code = code << self.bits | self._codes[char]
+        return code
+
+    def unpack(self, code: int) -> str:
+        chars = []
+        mask = self._base - 1
+        while code > 1:
+            chars.append(self.alphabet[code & mask])
+            code >>= self.bits
+        return ''.join(reversed(chars))
+
+    def length(self, code: int) -> int:
+        return (code.bit_length() - 1) // self.bits
+
+    def suffix(self, code: int) -> int:
+        """
+        Code of the string without its first char
+        """
+        top = 1 << (code.bit_length() - 1 - self.bits)
+        return code & (top - 1) | top
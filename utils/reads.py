@@ -0,0 +1,86 @@
+import gzip
+import io
+import sys
+from itertools import chain
+from typing import Iterable, Iterator, Optional, TextIO
+
+READ_FORMATS = ('fasta', 'fastq', 'plain')
+_GZIP_MAGIC = b'\x1f\x8b'
+
+
+def _open(path: str) -> TextIO:
+    """
+    Opens a text file, gzip-compressed files are detected by their magic bytes, '-' stands for stdin
+    """
+    if path == '-':
+        buffer = getattr(sys.stdin, 'buffer', None)
+        if buffer is not None and buffer.peek(2)[:2] == _GZIP_MAGIC:
+            return io.TextIOWrapper(gzip.GzipFile(fileobj=buffer))  # closing it leaves stdin open
+        return sys.stdin
+    raw = open(path, 'rb')
+    if raw.peek(2)[:2] == _GZIP_MAGIC:
+        raw.close()  # GzipFile doesn't close a file object it was given
+        return gzip.open(path, 'rt')
+    return io.TextIOWrapper(raw)
+
+
+def _fasta(lines: Iterable[str]) -> Iterator[str]:
+    sequence = []
+    for line in lines:
+        if line.startswith('>'):
+            if sequence:
+                yield ''.join(sequence)
+            sequence = []
+        else:
+            sequence.append(line)
+    if sequence:
+        yield ''.join(sequence)
+
+
+def _fastq(lines: Iterable[str]) -> Iterator[str]:
+    lines = iter(lines)
+    for header in lines:
+        if not header.startswith('@'):
+            raise ValueError(f'Malformed FASTQ record: {header}')
+        sequence = next(lines, None)
+        separator = next(lines, None)
+        qualities = next(lines, None)
+        if qualities is None:
+            raise ValueError(f'Truncated FASTQ record: {header}')
+        if not separator.startswith('+'):
+            raise ValueError(f'Malformed FASTQ record: {header}')
+        yield sequence
+
+
+def read_strings(path: str, read_format: Optional[str] = None, unique: bool = True) -> Iterator[str]:
+    """
+    Streams reads from a FASTA, FASTQ or plain (one read per line) file, possibly gzip-compressed.
+    Only one record is held in memory at a time, except for the set of already seen reads
+    :param path: path to the file, '-' for stdin
+    :param read_format: one of READ_FORMATS, detected by the first non-empty line if not given
+    :param unique: skip reads which were already yielded
+    """
+    if read_format is not None and read_format not in READ_FORMATS:
+        raise ValueError(f'Unknown read format {read_format}')
+
+    file = _open(path)
+    try:
+        lines = filter(None, (line.strip() for line in file))
+        first = next(lines, None)
+        if first is None:
+            return
+        if read_format is None:
+            read_format = {'>': 'fasta', '@': 'fastq'}.get(first[0], 'plain')
+        lines = chain([first], lines)
+
+        reads = {'fasta': _fasta, 'fastq': _fastq}.get(read_format, iter)(lines)
+        seen = set()
+        for read in reads:
+            if unique:
+                if read in seen:
+                    continue
+                seen.add(read)
+            yield read
+    finally:
+        if file is not sys.stdin:
+            file.close()
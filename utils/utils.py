@@ -1,4 +1,7 @@
-from typing import Dict, Iterable, List, Tuple
+from array import array
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from .aho_corasick import AhoCorasick
 
 
 def counting_sort(elements: Iterable[Tuple[int, int]], keys: Dict[Tuple[int, int], int]):
@@ -12,17 +15,63 @@ def counting_sort(elements: Iterable[Tuple[int, int]], keys: Dict[Tuple[int, int
     return [elem for lst in order for elem in lst]
 
 
-def ensure_substring_free(strings: List[str]) -> List[str]:
+def bucket_edges(n: int, weighted_edges: Iterable[Tuple[Tuple[int, int], int]]) -> Dict[int, array]:
+    """
+    Groups edges (i, j), 0 <= i, j < n, with positive weights by weight, see bucket_sort_edges
+    """
+    buckets: Dict[int, array] = {}
+    for (i, j), weight in weighted_edges:
+        if weight > 0:
+            if weight not in buckets:
+                buckets[weight] = array('q')
+            buckets[weight].append(i * n + j)
+    return buckets
+
+
+def drain_buckets(n: int, buckets: Dict[int, array]) -> Iterator[Tuple[int, int]]:
+    """
+    Yields the edges of bucket_edges in descending order of weights, every bucket is freed once it is drained
+    """
+    for weight in sorted(buckets, reverse=True):
+        bucket = buckets.pop(weight)
+        for edge in bucket:
+            yield divmod(edge, n)
+        del bucket
+
+
+def bucket_sort_edges(n: int, weighted_edges: Iterable[Tuple[Tuple[int, int], int]]) -> Iterator[Tuple[int, int]]:
+    """
+    Yields edges (i, j), 0 <= i, j < n, with positive weights in descending order of weights,
+    edges with equal weights keep the given order.
+    Unlike counting_sort, every bucket holds edges packed as i * n + j in an int array instead of tuples
+    """
+    yield from drain_buckets(n, bucket_edges(n, weighted_edges))
+
+
+def ensure_substring_free(strings: Iterable[str]) -> List[str]:
     """
-    Remove strings that are substrings of some other strings in the given list
+    Remove strings that are substrings of some other strings in the given list (or any iterable, e.g. a reader).
+    Every string is scanned once with the Aho–Corasick automaton over all the strings, and every node is reported
+    at most once, so this takes near-linear time. Duplicates are removed keeping the order of first occurrences
     """
-    strings = list(set(strings))
+    strings = list(dict.fromkeys(strings))
+    ac = AhoCorasick(strings)
+    children, fail, output, ends = ac.children, ac.fail, ac.output, ac.ends
+    covered = set()  # nodes whose output chain contains only already found substrings
     substrings = set()
-    for i in range(len(strings)):
-        for j in range(len(strings)):
-            if i == j:
-                continue
-            if strings[i] in strings[j]:
-                substrings.add(i)
+    for string in strings:
+        node = 0
+        for char in string:
+            while node and char not in children[node]:
+                node = fail[node]
+            node = children[node].get(char, 0)
+            match = node if node in ends else output[node]
+            while match and match not in covered:
+                if ac.depth[match] != len(string):  # string itself isn't its proper substring
+                    substrings.update(ends[match])
+                    covered.add(match)
+                match = output[match]
+    if len(strings) > 1:
+        substrings.update(ends.get(0, ()))  # the empty string
 
     return [string for i, string in enumerate(strings) if i not in substrings]
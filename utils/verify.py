@@ -0,0 +1,50 @@
+from multiprocessing import Pool
+from typing import List, Optional
+
+from .aho_corasick import AhoCorasick
+
+_worker_automaton: Optional[AhoCorasick] = None
+
+
+def missing_strings(automaton: AhoCorasick, superstring: str) -> List[int]:
+    """
+    Finds the strings of the automaton which don't occur in superstring by a single scan of it.
+    Every node is reported at most once, so it takes O(len(superstring) + total length of the strings)
+    :return: sorted indices of the missing strings
+    """
+    children, fail, output, ends = automaton.children, automaton.fail, automaton.output, automaton.ends
+    found = {0}  # the empty string occurs everywhere
+    node = 0
+    for char in superstring:
+        while node and char not in children[node]:
+            node = fail[node]
+        node = children[node].get(char, 0)
+        match = node if node in ends else output[node]
+        while match not in found:
+            found.add(match)
+            match = output[match]
+    return sorted(i for node, indices in ends.items() if node not in found for i in indices)
+
+
+def _init_worker(strings: List[str]):
+    global _worker_automaton
+    _worker_automaton = AhoCorasick(strings)
+
+
+def _missing_in_worker(superstring: str) -> List[int]:
+    return missing_strings(_worker_automaton, superstring)
+
+
+def verify_solutions(strings: List[str], solutions: List[str], workers: int = 1) -> List[List[str]]:
+    """
+    Checks that every solution contains all the strings, the automaton over the strings is built once per process
+    :param workers: number of processes checking the solutions
+    :return: the missing strings for every solution, all of the lists are empty if the solutions are valid
+    """
+    if workers > 1 and len(solutions) > 1:
+        with Pool(min(workers, len(solutions)), _init_worker, (strings,)) as pool:
+            missing = pool.map(_missing_in_worker, solutions)
+    else:
+        automaton = AhoCorasick(strings)
+        missing = [missing_strings(automaton, solution) for solution in solutions]
+    return [[strings[i] for i in indices] for indices in missing]